@@ -5,7 +5,7 @@ Provides the JobRepository class for CRUD operations on transcription jobs.
 """
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Callable, List, Optional, Union
 
 import aiosqlite
 
@@ -27,6 +27,17 @@ class JobRepository:
         await repo.close()
     """
 
+    _INSERT_SQL = """
+        INSERT INTO jobs (id, status, audio_path, model_size,
+                          created_at, started_at, completed_at,
+                          result_text, detected_language, error_message,
+                          download_progress, diarize, min_speakers, max_speakers,
+                          progress, progress_phase, progress_phase_pct,
+                          speaker_count, diarized, diarization_error,
+                          diarization_error_code)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
     def __init__(self, db_path: Union[Path, str]):
         """Initialize repository with database path.
 
@@ -35,6 +46,8 @@ class JobRepository:
         """
         self.db_path = db_path
         self._connection: Optional[aiosqlite.Connection] = None
+        # Called after each new job is committed (e.g. BackgroundWorker.wake)
+        self.on_create: Optional[Callable[[], None]] = None
 
     async def connect(self) -> None:
         """Open database connection with optimal settings.
@@ -64,50 +77,39 @@ class JobRepository:
     async def create(self, job: Job) -> Job:
         """Insert new job into database.
 
+        Notifies the on_create callback, if set, once the job is committed.
+
         Args:
             job: Job model instance to persist
 
         Returns:
             The same job instance (now persisted)
         """
-        await self._connection.execute(
-            """
-            INSERT INTO jobs (id, status, audio_path, model_size,
-                              created_at, started_at, completed_at,
-                              result_text, detected_language, error_message,
-                              download_progress, diarize, min_speakers, max_speakers,
-                              progress, progress_phase, progress_phase_pct,
-                              speaker_count, diarized, diarization_error,
-                              diarization_error_code)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                job.id,
-                job.status.value,
-                job.audio_path,
-                job.model_size,
-                job.created_at.isoformat(),
-                job.started_at.isoformat() if job.started_at else None,
-                job.completed_at.isoformat() if job.completed_at else None,
-                job.result_text,
-                job.detected_language,
-                job.error_message,
-                job.download_progress,
-                1 if job.diarize else 0,
-                job.min_speakers,
-                job.max_speakers,
-                job.progress,
-                job.progress_phase,
-                job.progress_phase_pct,
-                job.speaker_count,
-                1 if job.diarized else (0 if job.diarized is False else None),
-                job.diarization_error,
-                job.diarization_error_code,
-            ),
-        )
+        await self._connection.execute(self._INSERT_SQL, self._job_to_params(job))
         await self._connection.commit()
+        if self.on_create is not None:
+            self.on_create()
         return job
 
+    async def create_many(self, jobs: List[Job]) -> List[Job]:
+        """Insert several new jobs in a single transaction.
+
+        Notifies the on_create callback, if set, once after the batch commits.
+
+        Args:
+            jobs: Job model instances to persist
+
+        Returns:
+            The same job instances (now persisted)
+        """
+        await self._connection.executemany(
+            self._INSERT_SQL, [self._job_to_params(job) for job in jobs]
+        )
+        await self._connection.commit()
+        if jobs and self.on_create is not None:
+            self.on_create()
+        return jobs
+
     async def get(self, job_id: str) -> Optional[Job]:
         """Retrieve job by ID.
 
@@ -203,6 +205,39 @@ class JobRepository:
                 return self._row_to_job(row)
             return None
 
+    def _job_to_params(self, job: Job) -> tuple:
+        """Convert Job model to INSERT parameters, in _INSERT_SQL column order.
+
+        Args:
+            job: Job model instance
+
+        Returns:
+            Tuple of column values for the database
+        """
+        return (
+            job.id,
+            job.status.value,
+            job.audio_path,
+            job.model_size,
+            job.created_at.isoformat(),
+            job.started_at.isoformat() if job.started_at else None,
+            job.completed_at.isoformat() if job.completed_at else None,
+            job.result_text,
+            job.detected_language,
+            job.error_message,
+            job.download_progress,
+            1 if job.diarize else 0,
+            job.min_speakers,
+            job.max_speakers,
+            job.progress,
+            job.progress_phase,
+            job.progress_phase_pct,
+            job.speaker_count,
+            1 if job.diarized else (0 if job.diarized is False else None),
+            job.diarization_error,
+            job.diarization_error_code,
+        )
+
     def _row_to_job(self, row: tuple) -> Job:
         """Convert database row to Job model.
 
@@ -84,6 +84,8 @@ async def lifespan(app: FastAPI):
 
     logger.info("Starting background worker")
     worker = BackgroundWorker(repo, config=config)
+    # Start new jobs immediately instead of on the next poll
+    repo.on_create = worker.wake
     worker_task = asyncio.create_task(worker.run())
 
     # Store in app.state for endpoint access
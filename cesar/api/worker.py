@@ -16,7 +16,7 @@ from cesar.api.models import JobStatus
 from cesar.api.repository import JobRepository
 from cesar.config import CesarConfig
 from cesar.diarization import DiarizationError, AuthenticationError
-from cesar.whisperx_wrapper import WhisperXPipeline
+from cesar.whisperx_wrapper import WhisperXPipeline, resolve_hf_token
 from cesar.orchestrator import TranscriptionOrchestrator
 from cesar.transcriber import AudioTranscriber
 from cesar.youtube_handler import (
@@ -64,6 +64,7 @@ class BackgroundWorker:
         self.poll_interval = poll_interval
         self.config = config
         self._shutdown_event = asyncio.Event()
+        self._wake_event = asyncio.Event()
         self._current_job_id: Optional[str] = None
 
     @property
@@ -87,29 +88,10 @@ class BackgroundWorker:
     def _get_hf_token(self) -> Optional[str]:
         """Resolve HuggingFace token from config, env, or cache.
 
-        Resolution order:
-        1. self.config.hf_token if config provided
-        2. HF_TOKEN environment variable
-        3. ~/.cache/huggingface/token file
-
         Returns:
-            HF token or None if not found
+            HF token or None if not found (see resolve_hf_token)
         """
-        # Check config first
-        if self.config and self.config.hf_token:
-            return self.config.hf_token
-
-        # Try environment variable
-        env_token = os.getenv('HF_TOKEN')
-        if env_token:
-            return env_token
-
-        # Try cached token
-        token_path = Path.home() / '.cache' / 'huggingface' / 'token'
-        if token_path.exists():
-            return token_path.read_text().strip()
-
-        return None
+        return resolve_hf_token(self.config.hf_token if self.config else None)
 
     def _update_progress(
         self,
@@ -150,15 +132,16 @@ class BackgroundWorker:
                     # Process the job
                     await self._process_job(job)
                 else:
-                    # No job available, wait for poll interval or shutdown
+                    # No job available, wait for poll interval, wake() or shutdown
                     try:
                         await asyncio.wait_for(
-                            self._shutdown_event.wait(),
+                            self._wake_event.wait(),
                             timeout=self.poll_interval
                         )
                     except asyncio.TimeoutError:
                         # Timeout is expected - continue polling
                         pass
+                    self._wake_event.clear()
         except Exception as e:
             logger.error(f"Worker loop error: {e}", exc_info=True)
         finally:
@@ -172,6 +155,15 @@ class BackgroundWorker:
         """
         logger.info("Shutdown requested")
         self._shutdown_event.set()
+        self._wake_event.set()
+
+    def wake(self) -> None:
+        """Poll for jobs now instead of waiting out the poll interval.
+
+        Intended as the repository's on_create callback so new jobs are
+        picked up immediately. Safe to call while a job is processing.
+        """
+        self._wake_event.set()
 
     async def _process_job(self, job) -> None:
         """Process a single transcription job.
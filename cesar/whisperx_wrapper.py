@@ -8,10 +8,50 @@ All processing is offline after initial model download from HuggingFace.
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Callable, List
+from typing import Optional, Callable, List, Mapping
 
 from cesar.diarization import DiarizationError, AuthenticationError
 
+# Token file written by `huggingface-cli login`
+_HF_TOKEN_PATH = Path.home() / '.cache' / 'huggingface' / 'token'
+
+
+def resolve_hf_token(
+    token: Optional[str] = None,
+    env: Mapping[str, str] = os.environ,
+    cache_path: Optional[Path] = None
+) -> Optional[str]:
+    """Resolve HuggingFace token from a given value, env, or cache.
+
+    Resolution order:
+    1. token, if provided (e.g. from CesarConfig.hf_token)
+    2. HF_TOKEN in env
+    3. cache_path file (~/.cache/huggingface/token by default)
+
+    Args:
+        token: Explicitly provided token
+        env: Environment mapping to read HF_TOKEN from
+        cache_path: Path of the cached token file
+
+    Returns:
+        HF token or None if not found
+    """
+    if token:
+        return token
+
+    # Try environment variable
+    env_token = env.get('HF_TOKEN')
+    if env_token:
+        return env_token
+
+    # Try cached token
+    if cache_path is None:
+        cache_path = _HF_TOKEN_PATH
+    if cache_path.exists():
+        return cache_path.read_text().strip()
+
+    return None
+
 
 @dataclass
 class WhisperXSegment:
@@ -80,7 +120,7 @@ class WhisperXPipeline:
         """
         self.model_name = model_name or self.DEFAULT_MODEL
         self.batch_size = batch_size or self.DEFAULT_BATCH_SIZE
-        self.hf_token = self._resolve_token(hf_token)
+        self.hf_token = resolve_hf_token(hf_token)
 
         # Resolve device and compute type
         self.device = self._resolve_device(device)
@@ -93,35 +133,6 @@ class WhisperXPipeline:
         self._diarize_model = None
         self._current_language = None  # Track language for alignment model caching
 
-    def _resolve_token(self, provided_token: Optional[str]) -> Optional[str]:
-        """Resolve HF token from provided value, env, or cache.
-
-        Token resolution hierarchy:
-        1. Explicitly provided token
-        2. HF_TOKEN environment variable
-        3. Cached token from ~/.cache/huggingface/token
-
-        Args:
-            provided_token: Token provided by caller
-
-        Returns:
-            Resolved token or None
-        """
-        if provided_token:
-            return provided_token
-
-        # Try environment variable
-        env_token = os.getenv('HF_TOKEN')
-        if env_token:
-            return env_token
-
-        # Try cached token
-        token_path = Path.home() / '.cache' / 'huggingface' / 'token'
-        if token_path.exists():
-            return token_path.read_text().strip()
-
-        return None
-
     def _resolve_device(self, device: str) -> str:
         """Resolve device from auto to specific device.
 
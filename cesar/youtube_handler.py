@@ -4,31 +4,55 @@ YouTube audio download handler for Cesar Transcription.
 Provides functions to validate YouTube URLs and download audio using yt-dlp.
 Requires FFmpeg to be installed as a system binary.
 """
+import json
 import logging
+import os
 import re
 import shutil
+import string
 import tempfile
 import uuid
 from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-
-import yt_dlp
-from yt_dlp.utils import DownloadError, ExtractorError, PostProcessingError
+from urllib.parse import parse_qs, urlsplit
 
 logger = logging.getLogger(__name__)
 
 
 # === YouTube URL Patterns ===
 
-YOUTUBE_URL_PATTERNS = [
-    r'^https?://(?:www\.)?youtube\.com/watch\?v=[\w-]+',
-    r'^https?://(?:www\.)?youtube\.com/shorts/[\w-]+',
-    r'^https?://youtu\.be/[\w-]+',
-    r'^https?://(?:www\.)?youtube\.com/embed/[\w-]+',
-    r'^https?://(?:www\.)?youtube\.com/v/[\w-]+',
-]
-_YOUTUBE_REGEX = re.compile('|'.join(YOUTUBE_URL_PATTERNS))
+# Accepted URL prefixes; the video ID starts right after the prefix
+_YOUTUBE_URL_PREFIXES = tuple(
+    f'{scheme}://{host_path}'
+    for scheme in ('https', 'http')
+    for host_path in (
+        'www.youtube.com/watch?v=',
+        'youtube.com/watch?v=',
+        'www.youtube.com/shorts/',
+        'youtube.com/shorts/',
+        'youtu.be/',
+        'www.youtube.com/embed/',
+        'youtube.com/embed/',
+        'www.youtube.com/v/',
+        'youtube.com/v/',
+        'www.youtube.com/e/',
+        'youtube.com/e/',
+    )
+)
+
+# Characters allowed in an 11-character video ID
+_VIDEO_ID_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+
+# Path prefixes (first segment) followed by the video ID
+_VIDEO_ID_PATH_PREFIXES = frozenset({'shorts', 'embed', 'v', 'e'})
+
+# Longer inputs are rejected before any parsing; real YouTube URLs are
+# far shorter and browsers/servers commonly cap URLs at this length
+_MAX_URL_LENGTH = 2048
+
+# Extensions yt-dlp may leave the audio under, in order of preference
+_OUTPUT_EXTENSIONS = ('.m4a', '.mp3', '.opus', '.webm', '.wav', '.aac')
 
 
 # === Custom Exceptions ===
@@ -77,6 +101,14 @@ class FFmpegNotFoundError(YouTubeDownloadError):
 
 # === Video ID Extraction ===
 
+def _leading_video_id(value: str) -> Optional[str]:
+    """Return the first 11 characters of value if they form a video ID."""
+    video_id = value[:11]
+    if len(video_id) == 11 and _VIDEO_ID_CHARS.issuperset(video_id):
+        return video_id
+    return None
+
+
 def extract_video_id(url: str) -> str:
     """Extract video ID from YouTube URL.
 
@@ -86,52 +118,158 @@ def extract_video_id(url: str) -> str:
     Returns:
         11-character video ID, or 'unknown' if extraction fails
     """
-    if not url or not isinstance(url, str):
+    if not url or not isinstance(url, str) or len(url) > _MAX_URL_LENGTH:
         return "unknown"
 
-    # Pattern 1: v= parameter (watch URLs)
-    match = re.search(r'[?&]v=([a-zA-Z0-9_-]{11})', url)
-    if match:
-        return match.group(1)
-
-    # Pattern 2: youtu.be/ID
-    match = re.search(r'youtu\.be/([a-zA-Z0-9_-]{11})', url)
-    if match:
-        return match.group(1)
+    try:
+        parts = urlsplit(url)
+        # Without a scheme ('youtu.be/ID') urlsplit reads the host as part of
+        # the path; a leading '//' makes it parse as the network location
+        if not parts.scheme and not parts.netloc:
+            parts = urlsplit('//' + url)
+    except ValueError:
+        return "unknown"
 
-    # Pattern 3: /shorts/ID, /embed/ID, /v/ID
-    match = re.search(r'(?:/shorts/|/embed/|/v/)([a-zA-Z0-9_-]{11})', url)
-    if match:
-        return match.group(1)
+    # v= parameter (watch URLs)
+    for value in parse_qs(parts.query).get('v', ()):
+        video_id = _leading_video_id(value)
+        if video_id:
+            return video_id
+
+    segments = parts.path.split('/')
+    if len(segments) > 1:
+        # youtu.be/ID
+        if parts.hostname == 'youtu.be':
+            video_id = _leading_video_id(segments[1])
+            if video_id:
+                return video_id
+
+        # /shorts/ID, /embed/ID, /v/ID, /e/ID
+        if len(segments) > 2 and segments[1] in _VIDEO_ID_PATH_PREFIXES:
+            video_id = _leading_video_id(segments[2])
+            if video_id:
+                return video_id
 
     return "unknown"
 
 
 # === FFmpeg Validation ===
 
-@lru_cache(maxsize=1)
+# Messages returned by check_ffmpeg_available() when a binary is missing
+_FFMPEG_MISSING_MSG = (
+    "FFmpeg not found. YouTube transcription requires FFmpeg. "
+    "Install with: pacman -S ffmpeg (Arch), apt install ffmpeg (Debian), "
+    "or brew install ffmpeg (macOS)"
+)
+_FFPROBE_MISSING_MSG = "FFprobe not found. Install FFmpeg which includes ffprobe."
+
+# check_ffmpeg_available() result, computed on first call; reset to None
+# to force a fresh check
+_FFMPEG_CACHE: Optional[tuple[bool, str]] = None
+
+# Opt-in file recording where FFmpeg was found, keyed by $PATH, so later
+# processes can skip the PATH walk. Set CESAR_FFMPEG_RECORD to a file path
+# to enable it; None (the default) keeps the check in memory only
+_FFMPEG_PATHS_FILE: Optional[Path] = (
+    Path(os.environ['CESAR_FFMPEG_RECORD'])
+    if os.environ.get('CESAR_FFMPEG_RECORD') else None
+)
+
+
 def check_ffmpeg_available() -> tuple[bool, str]:
     """Check if FFmpeg binaries are available.
 
+    The result is cached for the life of the process. Nothing is written
+    to disk unless the CESAR_FFMPEG_RECORD record file is enabled.
+
     Returns:
         Tuple of (is_available, error_message_if_not)
     """
+    global _FFMPEG_CACHE
+    if _FFMPEG_CACHE is None:
+        _FFMPEG_CACHE = _detect_ffmpeg()
+    return _FFMPEG_CACHE
+
+
+def _detect_ffmpeg() -> tuple[bool, str]:
+    """Look up the ffmpeg and ffprobe binaries on PATH.
+
+    With the record file enabled, reuses the locations recorded by an
+    earlier process when $PATH is unchanged and both binaries are still
+    executable, skipping the PATH walk.
+    """
+    paths_file = _FFMPEG_PATHS_FILE
+    search_path = os.environ.get('PATH', '')
+    if paths_file is not None and _read_ffmpeg_paths(paths_file, search_path):
+        return True, ""
+
     ffmpeg = shutil.which('ffmpeg')
     ffprobe = shutil.which('ffprobe')
+    if paths_file is not None and ffmpeg and ffprobe:
+        _write_ffmpeg_paths(paths_file, search_path, ffmpeg, ffprobe)
 
     if not ffmpeg:
-        return False, (
-            "FFmpeg not found. YouTube transcription requires FFmpeg. "
-            "Install with: pacman -S ffmpeg (Arch), apt install ffmpeg (Debian), "
-            "or brew install ffmpeg (macOS)"
-        )
+        return False, _FFMPEG_MISSING_MSG
     if not ffprobe:
-        return False, (
-            "FFprobe not found. Install FFmpeg which includes ffprobe."
-        )
+        return False, _FFPROBE_MISSING_MSG
     return True, ""
 
 
+def _read_ffmpeg_paths(
+    paths_file: Path, search_path: str
+) -> Optional[tuple[str, str]]:
+    """Read recorded (ffmpeg, ffprobe) locations if still valid.
+
+    Args:
+        paths_file: Record file written by _write_ffmpeg_paths
+        search_path: Current $PATH value the record must match
+
+    Returns:
+        Tuple of binary paths, or None if absent, stale, or unreadable
+        (including binaries since removed or no longer executable)
+    """
+    try:
+        with open(paths_file, 'r') as f:
+            data = json.load(f)
+        if data['path'] != search_path:
+            return None
+        ffmpeg, ffprobe = data['ffmpeg'], data['ffprobe']
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        return None
+    for binary in (ffmpeg, ffprobe):
+        if not (os.path.isfile(binary) and os.access(binary, os.X_OK)):
+            return None
+    return ffmpeg, ffprobe
+
+
+def _write_ffmpeg_paths(
+    paths_file: Path, search_path: str, ffmpeg: str, ffprobe: str
+) -> None:
+    """Record FFmpeg binary locations in paths_file for later processes.
+
+    Best effort: failures are logged and otherwise ignored.
+    """
+    data = {'path': search_path, 'ffmpeg': ffmpeg, 'ffprobe': ffprobe}
+    try:
+        paths_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write atomically
+        tmp_fd, tmp_path = tempfile.mkstemp(
+            dir=paths_file.parent, prefix=".ffmpeg_", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(tmp_fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, paths_file)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    except OSError as e:
+        logger.debug(f"Could not record FFmpeg location: {e}")
+
+
 def require_ffmpeg() -> None:
     """Raise FFmpegNotFoundError if FFmpeg is not available."""
     available, error = check_ffmpeg_available()
@@ -150,9 +288,127 @@ def is_youtube_url(url: str) -> bool:
     Returns:
         True if URL matches YouTube patterns, False otherwise
     """
-    if not url or not isinstance(url, str):
+    if not url or not isinstance(url, str) or len(url) > _MAX_URL_LENGTH:
         return False
-    return bool(_YOUTUBE_REGEX.match(url.strip()))
+    return _has_youtube_prefix(url)
+
+
+@lru_cache(maxsize=256)
+def _has_youtube_prefix(url: str) -> bool:
+    """Match url against the accepted prefixes.
+
+    Cached because the same URL is validated by the API on submit and
+    again by download_youtube_audio in the worker.
+    """
+    url = url.strip()
+    # One startswith() over all prefixes rejects non-YouTube URLs
+    if not url.startswith(_YOUTUBE_URL_PREFIXES):
+        return False
+    for prefix in _YOUTUBE_URL_PREFIXES:
+        if url.startswith(prefix):
+            # At least one ID character ([A-Za-z0-9_-]) must follow
+            first = url[len(prefix):len(prefix) + 1]
+            return first in ('-', '_') or first.isalnum()
+    return False
+
+
+# === Download Error Classification ===
+
+# (name, substrings, exception class, message) checked in order against
+# the DownloadError text, ignoring case; the first rule with a matching
+# substring wins, so more specific rules come first
+_DOWNLOAD_ERROR_RULES = (
+    (
+        'age',
+        ('sign in to confirm your age',),
+        YouTubeAgeRestrictedError,
+        "Age-restricted video (video: {video_id}). "
+        "This video requires sign-in to verify age.",
+    ),
+    (
+        'private',
+        ('private video', 'is private'),
+        YouTubeUnavailableError,
+        "Private video (video: {video_id}). "
+        "This video is private and cannot be accessed.",
+    ),
+    (
+        'geo',
+        ('not available in your country', 'geo'),
+        YouTubeUnavailableError,
+        "Geo-restricted video (video: {video_id}). "
+        "This video is not available in your region.",
+    ),
+    (
+        'timeout',
+        ('timed out', 'timeout'),
+        YouTubeNetworkError,
+        "Network timeout (video: {video_id}). "
+        "Connection timed out. Check your network and try again.",
+    ),
+    (
+        'reset',
+        ('connection reset', 'errno 104'),
+        YouTubeNetworkError,
+        "Connection interrupted (video: {video_id}). "
+        "The connection was reset. Try again.",
+    ),
+    (
+        'network',
+        ('network', 'connection', 'urlopen'),
+        YouTubeNetworkError,
+        "Network error (video: {video_id}). "
+        "Could not connect to YouTube. Check your network and try again.",
+    ),
+    (
+        'rate_limit',
+        ('403', 'forbidden', '429'),
+        YouTubeRateLimitError,
+        "YouTube is limiting requests (video: {video_id}). "
+        "This is YouTube throttling connections. Try again later.",
+    ),
+    (
+        'unavailable',
+        ('unavailable',),
+        YouTubeUnavailableError,
+        "Video unavailable (video: {video_id}). "
+        "This video may have been deleted or made private.",
+    ),
+)
+
+
+# Each alternative is a lookahead anchored at the start, tried in rule
+# order, so lastgroup names the first rule whose substrings occur anywhere
+# in the text. A failing alternative rescans the message from the start:
+# a late or missing match still costs one scan per rule, as the any()
+# loop did, but the scans run inside the regex engine
+_DOWNLOAD_ERROR_REGEX = re.compile(
+    r'(?is)^(?:' + '|'.join(
+        f"(?=.*?(?P<{name}>{'|'.join(map(re.escape, substrings))}))"
+        for name, substrings, _, _ in _DOWNLOAD_ERROR_RULES
+    ) + ')'
+)
+_DOWNLOAD_ERRORS_BY_RULE = {
+    name: (error_class, message)
+    for name, _, error_class, message in _DOWNLOAD_ERROR_RULES
+}
+
+
+def _classify_download_error(error: Exception, video_id: str) -> YouTubeDownloadError:
+    """Map a yt-dlp DownloadError to the matching YouTubeDownloadError.
+
+    Args:
+        error: DownloadError raised by yt-dlp
+        video_id: Video ID to include in the message
+
+    Returns:
+        Exception instance to raise (YouTubeDownloadError if no rule matches)
+    """
+    match = _DOWNLOAD_ERROR_REGEX.match(str(error))
+    if match is None:
+        return YouTubeDownloadError(f"Download failed: {error}")
+    error_class, message = _DOWNLOAD_ERRORS_BY_RULE[match.lastgroup]
+    return error_class(message.format(video_id=video_id))
 
 
 # === Download Function ===
@@ -174,15 +430,20 @@ def download_youtube_audio(url: str, output_dir: Optional[Path] = None) -> Path:
         YouTubeRateLimitError: If rate limited
         YouTubeDownloadError: For other download errors
     """
-    require_ffmpeg()
-
     video_id = extract_video_id(url)
 
+    # Reject bad input before touching the system
     if not is_youtube_url(url):
         raise YouTubeURLError(
             f"Invalid YouTube URL (video: {video_id}). The URL format is not recognized."
         )
 
+    require_ffmpeg()
+
+    # yt-dlp is a heavy import; only pay for it once a download is certain
+    import yt_dlp
+    from yt_dlp.utils import DownloadError, ExtractorError, PostProcessingError
+
     # Set up output path
     if output_dir is None:
         output_dir = Path(tempfile.gettempdir()) / 'cesar-youtube'
@@ -192,14 +453,38 @@ def download_youtube_audio(url: str, output_dir: Optional[Path] = None) -> Path:
     base_name = str(uuid.uuid4())
     output_template = str(output_dir / base_name)
 
+    # yt-dlp passes the final file (after audio extraction) to post_hooks
+    finished_files: list[str] = []
+
+    # Audio-only: skip the video stream, playlists and side files
     ydl_opts = {
-        'format': 'bestaudio/best',
+        'format': 'bestaudio[ext=m4a]/bestaudio/best',
+        'noplaylist': True,
+        # Extractors for the URL forms is_youtube_url accepts: plain video
+        # URLs, watch URLs with &list=, other paths with ?list=, and
+        # youtu.be links with ?list=. Skips registering and matching
+        # against every other extractor
+        'allowed_extractors': [
+            'youtube', 'youtube:tab', 'youtube:playlist', 'youtubeytbe',
+        ],
+        # Ranged requests and parallel DASH fragments avoid YouTube's
+        # per-connection throttling of audio streams. yt-dlp queries every
+        # listed player client and merges their formats (web is not a
+        # fallback); ios stream URLs need no n-signature decryption
+        'http_chunk_size': 10 * 1024 * 1024,
+        'concurrent_fragment_downloads': 8,
+        'extractor_args': {'youtube': {'player_client': ['ios', 'web']}},
+        'writesubtitles': False,
+        'writeautomaticsub': False,
+        'writeinfojson': False,
+        'writethumbnail': False,
         'outtmpl': {'default': output_template},
         'postprocessors': [{
             'key': 'FFmpegExtractAudio',
             'preferredcodec': 'm4a',
             'preferredquality': '192',
         }],
+        'post_hooks': [finished_files.append],
         'quiet': True,
         'no_warnings': True,
         'noprogress': True,
@@ -212,66 +497,7 @@ def download_youtube_audio(url: str, output_dir: Optional[Path] = None) -> Path:
 
     except DownloadError as e:
         _cleanup_partial_files(output_dir, base_name)
-        error_str = str(e).lower()
-
-        # Age-restricted (most specific first)
-        if 'sign in to confirm your age' in error_str:
-            raise YouTubeAgeRestrictedError(
-                f"Age-restricted video (video: {video_id}). "
-                "This video requires sign-in to verify age."
-            ) from e
-
-        # Private video (check both "private video" and "is private")
-        if 'private video' in error_str or 'is private' in error_str:
-            raise YouTubeUnavailableError(
-                f"Private video (video: {video_id}). "
-                "This video is private and cannot be accessed."
-            ) from e
-
-        # Geo-restricted
-        if 'not available in your country' in error_str or 'geo' in error_str:
-            raise YouTubeUnavailableError(
-                f"Geo-restricted video (video: {video_id}). "
-                "This video is not available in your region."
-            ) from e
-
-        # Network timeout
-        if 'timed out' in error_str or 'timeout' in error_str:
-            raise YouTubeNetworkError(
-                f"Network timeout (video: {video_id}). "
-                "Connection timed out. Check your network and try again."
-            ) from e
-
-        # Connection reset
-        if 'connection reset' in error_str or 'errno 104' in error_str:
-            raise YouTubeNetworkError(
-                f"Connection interrupted (video: {video_id}). "
-                "The connection was reset. Try again."
-            ) from e
-
-        # General network error
-        if any(term in error_str for term in ['network', 'connection', 'urlopen']):
-            raise YouTubeNetworkError(
-                f"Network error (video: {video_id}). "
-                "Could not connect to YouTube. Check your network and try again."
-            ) from e
-
-        # Rate limiting (403, 429)
-        if '403' in error_str or 'forbidden' in error_str or '429' in error_str:
-            raise YouTubeRateLimitError(
-                f"YouTube is limiting requests (video: {video_id}). "
-                "This is YouTube throttling connections. Try again later."
-            ) from e
-
-        # General unavailable
-        if 'unavailable' in error_str:
-            raise YouTubeUnavailableError(
-                f"Video unavailable (video: {video_id}). "
-                "This video may have been deleted or made private."
-            ) from e
-
-        # Fallback
-        raise YouTubeDownloadError(f"Download failed: {e}") from e
+        raise _classify_download_error(e, video_id) from e
 
     except ExtractorError as e:
         _cleanup_partial_files(output_dir, base_name)
@@ -287,20 +513,40 @@ def download_youtube_audio(url: str, output_dir: Optional[Path] = None) -> Path:
         _cleanup_partial_files(output_dir, base_name)
         raise YouTubeDownloadError(f"Unexpected error: {e}") from e
 
-    # Find the actual output file (yt-dlp adds extension)
-    expected_path = output_dir / f"{base_name}.m4a"
-    if expected_path.exists():
-        return expected_path
+    if finished_files:
+        return Path(finished_files[-1])
+
+    # No hook call; find the actual output file (yt-dlp adds extension)
+    output_path = _find_output_file(output_dir, base_name)
+    if output_path is None:
+        raise YouTubeDownloadError(
+            "Download appeared to succeed but output file not found"
+        )
+    return output_path
 
-    # Check alternative extensions
-    for ext in ['.mp3', '.opus', '.webm', '.wav', '.aac']:
-        alt_path = output_dir / f"{base_name}{ext}"
-        if alt_path.exists():
-            return alt_path
 
-    raise YouTubeDownloadError(
-        "Download appeared to succeed but output file not found"
-    )
+def _find_output_file(directory: Path, base_name: str) -> Optional[Path]:
+    """Find the downloaded audio file for base_name.
+
+    Reads the directory once rather than probing each extension.
+
+    Args:
+        directory: Directory yt-dlp wrote to
+        base_name: Base filename (UUID) of the download
+
+    Returns:
+        Path with the most preferred extension, or None if none exists
+    """
+    candidates = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            stem, ext = os.path.splitext(entry.name)
+            if stem == base_name:
+                candidates[ext] = entry.path
+    for ext in _OUTPUT_EXTENSIONS:
+        if ext in candidates:
+            return Path(candidates[ext])
+    return None
 
 
 def _cleanup_partial_files(directory: Path, base_name: str) -> None:
@@ -310,18 +556,21 @@ def _cleanup_partial_files(directory: Path, base_name: str) -> None:
         directory: Directory containing partial files
         base_name: Base filename (UUID) to match
     """
-    patterns = [
-        f"{base_name}.*",
-        f"{base_name}.*.part",
-        f"{base_name}.*.ytdl",
-    ]
-    for pattern in patterns:
-        for file in directory.glob(pattern):
-            try:
-                file.unlink()
-                logger.debug(f"Cleaned up partial file: {file}")
-            except OSError:
-                pass
+    # Covers <uuid>.<ext> as well as <uuid>.<ext>.part and .ytdl leftovers
+    prefix = f"{base_name}."
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return
+
+    with entries:
+        for entry in entries:
+            if entry.name.startswith(prefix):
+                try:
+                    os.unlink(entry.path)
+                    logger.debug(f"Cleaned up partial file: {entry.path}")
+                except OSError:
+                    pass
 
 
 def cleanup_youtube_temp_dir() -> int:
@@ -334,16 +583,20 @@ def cleanup_youtube_temp_dir() -> int:
         Number of files removed
     """
     temp_dir = Path(tempfile.gettempdir()) / 'cesar-youtube'
-    if not temp_dir.exists():
+    try:
+        entries = os.scandir(temp_dir)
+    except FileNotFoundError:
         return 0
 
     count = 0
-    for file in temp_dir.iterdir():
-        if file.is_file():
-            try:
-                file.unlink()
-                count += 1
-                logger.debug(f"Cleaned up orphaned temp file: {file}")
-            except OSError:
-                pass
+    with entries:
+        for entry in entries:
+            # d_type from the directory listing; no stat per entry
+            if entry.is_file(follow_symlinks=False):
+                try:
+                    os.unlink(entry.path)
+                    count += 1
+                    logger.debug(f"Cleaned up orphaned temp file: {entry.path}")
+                except OSError:
+                    pass
     return count
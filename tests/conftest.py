@@ -0,0 +1,129 @@
+"""
+Shared pytest configuration for the cesar test suite.
+
+Provides the shared API client fixtures used by the server tests, and a
+per-test FFmpeg location record for tests that check for FFmpeg. The
+FastAPI server module (and with it the models, worker and YouTube
+handler) is imported by the session-scoped `server` fixture the first
+time a test needs it, rather than at the top of this file or
+test_server.py. Other test modules that import `cesar.api` at module
+scope (test_worker.py, test_repository.py) still import the server
+while the suite is collected.
+"""
+import contextlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def ffmpeg_paths_file(monkeypatch, tmp_path):
+    """Point the opt-in FFmpeg location record at a file under tmp_path.
+
+    For tests that reach check_ffmpeg_available() (the FFmpeg tests and
+    the unpatched /health tests), so a CESAR_FFMPEG_RECORD set in the
+    developer's environment is never read or written.
+    """
+    paths_file = tmp_path / "ffmpeg.json"
+    monkeypatch.setattr("cesar.youtube_handler._FFMPEG_PATHS_FILE", paths_file)
+    return paths_file
+
+
+@pytest.fixture(scope="session")
+def server():
+    """The imported cesar.api.server module."""
+    from cesar.api import server
+
+    return server
+
+
+@pytest.fixture(scope="session")
+def plain_client(server):
+    """TestClient that never enters the app lifespan.
+
+    For endpoints that do not touch the repository or worker
+    (health, OpenAPI docs), so no startup work is performed.
+    """
+    return TestClient(server.app)
+
+
+@pytest.fixture(scope="session")
+def make_job():
+    """Factory for known-valid Job doubles that skips pydantic validation.
+
+    Returns:
+        Callable taking Job field overrides; ``status`` may be a JobStatus
+        or its string value.
+    """
+    from cesar.api.models import Job, JobStatus
+
+    def _make_job(**fields):
+        fields.setdefault("audio_path", "/path/to/audio.mp3")
+        fields["status"] = JobStatus(fields.get("status", JobStatus.QUEUED))
+        return Job.model_construct(**fields)
+
+    return _make_job
+
+
+@pytest.fixture(scope="session")
+def openapi_schema(plain_client):
+    """The app's OpenAPI schema, fetched (and therefore generated) once."""
+    return plain_client.get("/openapi.json").json()
+
+
+@pytest.fixture(scope="session")
+def server_mocks():
+    """Repository and worker doubles built once and shared by every lifespan.
+
+    Building a MagicMock with its AsyncMock children is comparatively
+    expensive, so the skeletons are created a single time per session;
+    tests that assert on calls go through `api`, which resets them.
+
+    Returns:
+        Tuple of (mock_repo, mock_worker)
+    """
+    mock_repo = MagicMock()
+    mock_repo.connect = AsyncMock()
+    mock_repo.close = AsyncMock()
+    mock_repo.get = AsyncMock()
+    mock_repo.list_all = AsyncMock(return_value=[])
+    mock_repo.create = AsyncMock()
+    mock_repo.update = AsyncMock()
+
+    mock_worker = MagicMock()
+    mock_worker.run = AsyncMock()
+    mock_worker.shutdown = AsyncMock()
+
+    return mock_repo, mock_worker
+
+
+@pytest.fixture(scope="session")
+def lifespan_client(server, server_mocks):
+    """TestClient with lifespan run once per session against mocked doubles.
+
+    Entering the client starts its anyio portal thread and runs the app
+    lifespan, so it is done a single time and every test reuses the same
+    portal. The patches are only needed while the lifespan constructs the
+    repository and worker, so they are removed before tests run.
+
+    Yields:
+        Tuple of (client, mock_repo)
+    """
+    mock_repo, mock_worker = server_mocks
+
+    with contextlib.ExitStack() as stack:
+        with patch.object(server, "JobRepository", return_value=mock_repo), \
+                patch.object(server, "BackgroundWorker", return_value=mock_worker):
+            client = stack.enter_context(TestClient(server.app))
+        yield client, mock_repo
+
+
+@pytest.fixture
+def api(lifespan_client):
+    """Per-test view of the shared lifespan client with a clean mock repository."""
+    client, mock_repo = lifespan_client
+    mock_repo.reset_mock(return_value=True, side_effect=True)
+    # Other tests may have run their own lifespan against the same app
+    client.app.state.repo = mock_repo
+    return client, mock_repo
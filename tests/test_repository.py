@@ -44,6 +44,29 @@ class TestJobRepository(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(retrieved.status, JobStatus.QUEUED)
         self.assertIsInstance(retrieved.created_at, datetime)
 
+    async def test_create_calls_on_create(self):
+        """Test on_create is notified once per committed job."""
+        calls = []
+        self.repo.on_create = lambda: calls.append(True)
+
+        await self.repo.create(Job(audio_path="/test/audio.mp3"))
+
+        self.assertEqual(len(calls), 1)
+
+    async def test_create_many(self):
+        """Test create_many persists a batch and notifies on_create once."""
+        calls = []
+        self.repo.on_create = lambda: calls.append(True)
+        jobs = [Job(audio_path=f"/test/audio{i}.mp3") for i in range(3)]
+
+        created = await self.repo.create_many(jobs)
+
+        self.assertIs(created, jobs)
+        for job in jobs:
+            retrieved = await self.repo.get(job.id)
+            self.assertEqual(retrieved.audio_path, job.audio_path)
+        self.assertEqual(len(calls), 1)
+
     async def test_create_job_fields_preserved(self):
         """Test all job fields are preserved through create/get cycle."""
         now = datetime.utcnow()
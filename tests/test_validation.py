@@ -2,85 +2,83 @@
 """
 Tests for input validation functions in AudioTranscriber
 """
-import unittest
-import tempfile
-import os
-import shutil
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
+
+import pytest
 
 from cesar.device_detection import DeviceCapabilities
 
 
-class TestValidation(unittest.TestCase):
-    """Test input validation functions"""
+@pytest.fixture(scope="module", autouse=True)
+def mock_device_caps():
+    """Patch device detection once for the module to avoid importing torch."""
+    with patch(
+        'cesar.device_detection.DeviceDetector.get_capabilities',
+        return_value=DeviceCapabilities(
+            has_cuda=False, has_mps=False, cpu_cores=4, optimal_threads=4
+        ),
+    ):
+        yield
 
-    def setUp(self):
-        """Set up test files"""
-        self.temp_dir = tempfile.mkdtemp()
 
-        # Create test audio files
-        self.valid_audio_file = Path(self.temp_dir) / "test.mp3"
-        self.valid_audio_file.touch()
+@pytest.fixture(scope="module")
+def audio_dir(tmp_path_factory):
+    """Temp dir with a supported (test.mp3) and unsupported (test.txt) file."""
+    temp_dir = tmp_path_factory.mktemp("validation")
+    (temp_dir / "test.mp3").touch()
+    (temp_dir / "test.txt").touch()
+    return temp_dir
 
-        self.unsupported_file = Path(self.temp_dir) / "test.txt"
-        self.unsupported_file.touch()
 
-        # Mock device detection to avoid importing torch
-        self.mock_caps_patcher = patch('cesar.device_detection.DeviceDetector.get_capabilities')
-        self.mock_caps = self.mock_caps_patcher.start()
-        self.mock_caps.return_value = DeviceCapabilities(
-            has_cuda=False, has_mps=False, cpu_cores=4, optimal_threads=4
-        )
-
-        # Import and create transcriber after mocking
-        from cesar.transcriber import AudioTranscriber
-        self.transcriber = AudioTranscriber()
-
-    def tearDown(self):
-        """Clean up test files"""
-        self.mock_caps_patcher.stop()
-        shutil.rmtree(self.temp_dir)
-
-    def test_validate_input_file_exists(self):
-        """Test validation of existing audio file"""
-        result = self.transcriber.validate_input_file(str(self.valid_audio_file))
-        self.assertEqual(result, self.valid_audio_file)
-
-    def test_validate_input_file_not_found(self):
-        """Test validation of non-existent file"""
-        with self.assertRaises(FileNotFoundError):
-            self.transcriber.validate_input_file("nonexistent.mp3")
-
-    def test_validate_input_file_unsupported_format(self):
-        """Test validation of unsupported file format"""
-        with self.assertRaises(ValueError):
-            self.transcriber.validate_input_file(str(self.unsupported_file))
-
-    def test_validate_input_file_directory(self):
-        """Test validation when path is a directory"""
-        with self.assertRaises(ValueError):
-            self.transcriber.validate_input_file(self.temp_dir)
-
-    def test_validate_output_path_valid(self):
-        """Test validation of valid output path"""
-        output_path = Path(self.temp_dir) / "output.txt"
-        result = self.transcriber.validate_output_path(str(output_path))
-        self.assertEqual(result, output_path)
-
-    def test_validate_output_path_creates_directory(self):
-        """Test that output validation creates parent directories"""
-        output_path = Path(self.temp_dir) / "subdir" / "output.txt"
-        result = self.transcriber.validate_output_path(str(output_path))
-        self.assertEqual(result, output_path)
-        self.assertTrue(output_path.parent.exists())
-
-    def test_supported_audio_formats(self):
-        """Test that all expected audio formats are supported"""
-        from cesar.transcriber import AudioTranscriber
-        expected_formats = {'.mp3', '.wav', '.m4a', '.ogg', '.flac', '.aac', '.wma'}
-        self.assertEqual(AudioTranscriber.SUPPORTED_FORMATS, expected_formats)
-
-
-if __name__ == "__main__":
-    unittest.main()
+@pytest.fixture(scope="module")
+def transcriber(mock_device_caps):
+    """One transcriber for every test; validation methods are pure."""
+    from cesar.transcriber import AudioTranscriber
+    return AudioTranscriber()
+
+
+def test_validate_input_file_exists(transcriber, audio_dir):
+    """Test validation of existing audio file"""
+    valid_audio_file = audio_dir / "test.mp3"
+    result = transcriber.validate_input_file(str(valid_audio_file))
+    assert result == valid_audio_file
+
+
+def test_validate_input_file_not_found(transcriber):
+    """Test validation of non-existent file"""
+    with pytest.raises(FileNotFoundError):
+        transcriber.validate_input_file("nonexistent.mp3")
+
+
+def test_validate_input_file_unsupported_format(transcriber, audio_dir):
+    """Test validation of unsupported file format"""
+    with pytest.raises(ValueError):
+        transcriber.validate_input_file(str(audio_dir / "test.txt"))
+
+
+def test_validate_input_file_directory(transcriber, audio_dir):
+    """Test validation when path is a directory"""
+    with pytest.raises(ValueError):
+        transcriber.validate_input_file(str(audio_dir))
+
+
+def test_validate_output_path_valid(transcriber, audio_dir, request):
+    """Test validation of valid output path"""
+    output_path = audio_dir / f"{request.node.name}.txt"
+    result = transcriber.validate_output_path(str(output_path))
+    assert result == output_path
+
+
+def test_validate_output_path_creates_directory(transcriber, audio_dir, request):
+    """Test that output validation creates parent directories"""
+    output_path = audio_dir / f"subdir_{request.node.name}" / "output.txt"
+    result = transcriber.validate_output_path(str(output_path))
+    assert result == output_path
+    assert output_path.parent.exists()
+
+
+def test_supported_audio_formats():
+    """Test that all expected audio formats are supported"""
+    from cesar.transcriber import AudioTranscriber
+    expected_formats = {'.mp3', '.wav', '.m4a', '.ogg', '.flac', '.aac', '.wma'}
+    assert AudioTranscriber.SUPPORTED_FORMATS == expected_formats
@@ -1,16 +1,188 @@
-"""Unit tests for WhisperX wrapper module."""
+"""Unit tests for WhisperX wrapper module.
+
+Safe under pytest-xdist: the fake whisperx module is installed into
+sys.modules, which is per-process, and --dist=loadfile keeps this file's
+setUpModule/setUpClass work on a single worker.
+"""
+import contextlib
+import functools
+import tempfile
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 import os
 import sys
 
+from cesar import whisperx_wrapper
 from cesar.whisperx_wrapper import (
     WhisperXPipeline,
     WhisperXSegment,
+    resolve_hf_token,
 )
 from cesar.diarization import DiarizationError, AuthenticationError
 
+# torch, imported once in setUpModule; None when it is not installed
+torch = None
+
+
+def setUpModule():
+    """Pay the heavy torch import once, off the per-test path."""
+    global torch
+    try:
+        import torch
+    except ImportError:
+        torch = None
+
+
+def tearDownModule():
+    """Drop any leftover whisperx entry so later modules import it afresh."""
+    sys.modules.pop('whisperx', None)
+
+
+# Progress phases transcribe_and_diarize must report
+_EXPECTED_PHASES = frozenset({
+    "Loading audio...",
+    "Transcribing...",
+    "Aligning timestamps...",
+    "Detecting speakers...",
+    "Assigning speakers...",
+    "Complete",
+})
+
+# Raw whisperx results for the _convert_to_segments tests, built once at
+# import; read-only mappings since the conversion must not mutate its input
+_BASIC_RESULT = MappingProxyType({
+    "segments": [
+        {"start": 0.0, "end": 5.0, "text": "Hello.", "speaker": "SPEAKER_00"},
+        {"start": 5.0, "end": 10.0, "text": "Hi.", "speaker": "SPEAKER_01"}
+    ]
+})
+_PADDED_TEXT_RESULT = MappingProxyType({
+    "segments": [
+        {"start": 0.0, "end": 5.0, "text": "  Hello.  ", "speaker": "SPEAKER_00"}
+    ]
+})
+_EMPTY_RESULT = MappingProxyType({"segments": []})
+
+
+class _WhisperxSpec:
+    """The whisperx module surface the wrapper uses; spec for module mocks."""
+
+    load_model = None
+    load_audio = None
+    load_align_model = None
+    align = None
+    DiarizationPipeline = None
+    assign_word_speakers = None
+
+
+_MISSING = object()
+
+
+@contextlib.contextmanager
+def _install_whisperx(mock):
+    """Install mock as sys.modules['whisperx'], restoring only that key on exit.
+
+    Cheaper than patch.dict('sys.modules', ...), which copies and restores
+    the whole module table.
+    """
+    prev = sys.modules.get('whisperx', _MISSING)
+    sys.modules['whisperx'] = mock
+    try:
+        yield
+    finally:
+        if prev is _MISSING:
+            sys.modules.pop('whisperx', None)
+        else:
+            sys.modules['whisperx'] = prev
+
+
+class _FakeAudio:
+    """Audio-array stand-in; the pipeline only ever takes len() of it."""
+
+    __slots__ = ('_n',)
+
+    def __init__(self, n):
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+
+@functools.lru_cache(maxsize=1)
+def _build_mock_whisperx_template():
+    """Build the child mocks of a fake whisperx module once per test run.
+
+    Returns:
+        Dict of the pre-configured audio, transcription model, alignment
+        model/metadata and diarization pipeline doubles
+    """
+    # Audio loading returns a numpy-like array; only its length is used
+    mock_audio = _FakeAudio(160000)  # 10 seconds at 16kHz
+
+    # Mock transcription
+    mock_model = Mock()
+    mock_model.transcribe.return_value = {
+        "language": "en",
+        "segments": [
+            {"start": 0.0, "end": 5.0, "text": "Hello there."},
+            {"start": 5.0, "end": 10.0, "text": "How are you?"}
+        ]
+    }
+
+    # Mock diarization
+    mock_diarize_pipeline = Mock()
+    mock_diarize_pipeline.return_value = Mock()
+
+    return {
+        "audio": mock_audio,
+        "model": mock_model,
+        "align_model": Mock(),
+        "align_metadata": Mock(),
+        "diarize_pipeline": mock_diarize_pipeline,
+    }
+
+
+def _create_mock_whisperx():
+    """Create a fully mocked whisperx module from the cached child mocks.
+
+    The top-level module mock is fresh on every call, so tests may
+    reconfigure it (e.g. assign_word_speakers) without touching the
+    shared template; the children only have their call records reset.
+    """
+    template = _build_mock_whisperx_template()
+    for child in template.values():
+        if isinstance(child, Mock):
+            child.reset_mock()
+
+    mock_whisperx = Mock(spec=_WhisperxSpec)
+    mock_whisperx.load_audio.return_value = template["audio"]
+    mock_whisperx.load_model.return_value = template["model"]
+
+    # Mock alignment
+    mock_whisperx.load_align_model.return_value = (
+        template["align_model"], template["align_metadata"]
+    )
+    mock_whisperx.align.return_value = {
+        "segments": [
+            {"start": 0.0, "end": 5.0, "text": "Hello there.", "speaker": "SPEAKER_00"},
+            {"start": 5.0, "end": 10.0, "text": "How are you?", "speaker": "SPEAKER_01"}
+        ]
+    }
+
+    mock_whisperx.DiarizationPipeline.return_value = template["diarize_pipeline"]
+
+    # Mock speaker assignment
+    mock_whisperx.assign_word_speakers.return_value = {
+        "segments": [
+            {"start": 0.0, "end": 5.0, "text": "Hello there.", "speaker": "SPEAKER_00"},
+            {"start": 5.0, "end": 10.0, "text": "How are you?", "speaker": "SPEAKER_01"}
+        ]
+    }
+
+    return mock_whisperx
+
 
 class TestWhisperXSegment(unittest.TestCase):
     """Tests for WhisperXSegment dataclass."""
@@ -57,30 +229,33 @@ class TestWhisperXSegment(unittest.TestCase):
 class TestWhisperXPipelineInit(unittest.TestCase):
     """Tests for WhisperXPipeline initialization."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build one pipeline per distinct constructor call; tests only read them."""
+        cls._default = WhisperXPipeline()
+        cls._base = WhisperXPipeline(model_name="base")
+        cls._bs8 = WhisperXPipeline(batch_size=8)
+        cls._token = WhisperXPipeline(hf_token="test_token")
+
     def test_default_model_name(self):
         """Test default model is large-v2."""
-        pipeline = WhisperXPipeline()
-        self.assertEqual(pipeline.model_name, "large-v2")
+        self.assertEqual(self._default.model_name, "large-v2")
 
     def test_default_batch_size(self):
         """Test default batch size is 16."""
-        pipeline = WhisperXPipeline()
-        self.assertEqual(pipeline.batch_size, 16)
+        self.assertEqual(self._default.batch_size, 16)
 
     def test_custom_model_name(self):
         """Test custom model name."""
-        pipeline = WhisperXPipeline(model_name="base")
-        self.assertEqual(pipeline.model_name, "base")
+        self.assertEqual(self._base.model_name, "base")
 
     def test_custom_batch_size(self):
         """Test custom batch size."""
-        pipeline = WhisperXPipeline(batch_size=8)
-        self.assertEqual(pipeline.batch_size, 8)
+        self.assertEqual(self._bs8.batch_size, 8)
 
     def test_init_with_token(self):
         """Test initialization with provided token."""
-        pipeline = WhisperXPipeline(hf_token="test_token")
-        self.assertEqual(pipeline.hf_token, "test_token")
+        self.assertEqual(self._token.hf_token, "test_token")
 
     @patch.dict(os.environ, {"HF_TOKEN": "env_token"})
     def test_token_from_environment(self):
@@ -91,15 +266,16 @@ class TestWhisperXPipelineInit(unittest.TestCase):
     @patch.dict(os.environ, {}, clear=True)
     def test_token_from_cache(self):
         """Test token resolution from cached file."""
-        with patch.object(Path, 'exists', return_value=True):
-            with patch.object(Path, 'read_text', return_value="cached_token\n"):
-                pipeline = WhisperXPipeline()
-                self.assertEqual(pipeline.hf_token, "cached_token")
+        fake_path = SimpleNamespace(exists=lambda: True, read_text=lambda: "cached_token\n")
+        with patch.object(whisperx_wrapper, '_HF_TOKEN_PATH', new=fake_path):
+            pipeline = WhisperXPipeline()
+            self.assertEqual(pipeline.hf_token, "cached_token")
 
     @patch.dict(os.environ, {}, clear=True)
     def test_token_none_when_not_found(self):
         """Test token is None when not found."""
-        with patch.object(Path, 'exists', return_value=False):
+        fake_path = SimpleNamespace(exists=lambda: False)
+        with patch.object(whisperx_wrapper, '_HF_TOKEN_PATH', new=fake_path):
             pipeline = WhisperXPipeline()
             self.assertIsNone(pipeline.hf_token)
 
@@ -110,87 +286,127 @@ class TestWhisperXPipelineInit(unittest.TestCase):
             self.assertEqual(pipeline.hf_token, "provided_token")
 
 
-class TestWhisperXPipelineDeviceResolution(unittest.TestCase):
-    """Tests for device resolution."""
+class TestResolveHFToken(unittest.TestCase):
+    """Test cases for resolve_hf_token; env and cache path are injected."""
 
-    def test_explicit_cpu_device(self):
-        """Test explicit cpu device passes through."""
-        pipeline = WhisperXPipeline(device="cpu")
-        self.assertEqual(pipeline.device, "cpu")
+    @classmethod
+    def setUpClass(cls):
+        """Write a cached token file and pick a cache path that never exists."""
+        temp_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(temp_dir.cleanup)
+        cls.cache_path = Path(temp_dir.name) / "token"
+        cls.cache_path.write_text("token_from_cache\n")
+        cls.missing_path = Path(temp_dir.name) / "missing"
 
-    def test_explicit_cuda_device(self):
-        """Test explicit cuda device passes through."""
-        pipeline = WhisperXPipeline(device="cuda")
-        self.assertEqual(pipeline.device, "cuda")
+    def test_hf_token_provided(self):
+        """Test a provided token is returned as-is."""
+        self.assertEqual(
+            resolve_hf_token("token_provided", env={}, cache_path=self.missing_path),
+            "token_provided"
+        )
 
-    def test_auto_selects_cuda_when_available(self):
-        """Test auto selects cuda when available."""
-        import torch
-        with patch.object(torch.cuda, 'is_available', return_value=True):
-            pipeline = WhisperXPipeline.__new__(WhisperXPipeline)
-            result = pipeline._resolve_device("auto")
-            self.assertEqual(result, "cuda")
+    def test_hf_token_from_env(self):
+        """Test HF token resolution from environment variable."""
+        self.assertEqual(
+            resolve_hf_token(None, env={"HF_TOKEN": "token_from_env"}, cache_path=self.missing_path),
+            "token_from_env"
+        )
 
-    def test_auto_selects_cpu_when_cuda_unavailable(self):
-        """Test auto selects cpu when cuda unavailable."""
-        import torch
-        with patch.object(torch.cuda, 'is_available', return_value=False):
-            pipeline = WhisperXPipeline.__new__(WhisperXPipeline)
-            result = pipeline._resolve_device("auto")
-            self.assertEqual(result, "cpu")
+    def test_hf_token_from_cache(self):
+        """Test HF token resolution from cached file."""
+        self.assertEqual(
+            resolve_hf_token(None, env={}, cache_path=self.cache_path),
+            "token_from_cache"
+        )
 
-    def test_auto_selects_cpu_when_torch_import_fails(self):
-        """Test auto selects cpu when torch import fails."""
-        # Create pipeline instance directly
-        pipeline = WhisperXPipeline.__new__(WhisperXPipeline)
+    def test_hf_token_none_when_not_found(self):
+        """Test HF token is None when no source available."""
+        self.assertIsNone(resolve_hf_token(None, env={}, cache_path=self.missing_path))
+
+    def test_hf_token_provided_priority(self):
+        """Test a provided token takes priority over env and cache."""
+        self.assertEqual(
+            resolve_hf_token(
+                "token_provided", env={"HF_TOKEN": "token_from_env"}, cache_path=self.cache_path
+            ),
+            "token_provided"
+        )
 
-        # Mock the import to raise ImportError
-        original_import = __builtins__['__import__'] if isinstance(__builtins__, dict) else __builtins__.__import__
 
-        def mock_import(name, *args, **kwargs):
-            if name == 'torch':
-                raise ImportError("No module named torch")
-            return original_import(name, *args, **kwargs)
+class TestWhisperXPipelineDeviceResolution(unittest.TestCase):
+    """Tests for device resolution."""
 
-        with patch('builtins.__import__', side_effect=mock_import):
-            result = pipeline._resolve_device("auto")
-            self.assertEqual(result, "cpu")
+    @classmethod
+    def setUpClass(cls):
+        """Bare instance shared by the _resolve_device tests (no __init__ work)."""
+        cls._bare = WhisperXPipeline.__new__(WhisperXPipeline)
+
+    def test_explicit_device_passes_through(self):
+        """Test an explicit device passes through."""
+        for device in ("cpu", "cuda"):
+            with self.subTest(device=device):
+                pipeline = WhisperXPipeline(device=device)
+                self.assertEqual(pipeline.device, device)
+
+    def test_auto_device_follows_cuda_availability(self):
+        """Test auto selects cuda when available and cpu otherwise."""
+        if torch is None:
+            self.skipTest("torch not installed")
+        for cuda_available, expected in ((True, "cuda"), (False, "cpu")):
+            with self.subTest(cuda_available=cuda_available), \
+                    patch.object(torch.cuda, 'is_available', return_value=cuda_available):
+                self.assertEqual(self._bare._resolve_device("auto"), expected)
+
+    def test_auto_selects_cpu_when_torch_import_fails(self):
+        """Test auto selects cpu when torch import fails."""
+        # A None entry makes `import torch` raise ImportError immediately
+        with patch.dict(sys.modules, {'torch': None}):
+            self.assertEqual(self._bare._resolve_device("auto"), "cpu")
 
 
 class TestWhisperXPipelineComputeType(unittest.TestCase):
     """Tests for compute type resolution."""
 
-    def test_explicit_float32_passes_through(self):
-        """Test explicit compute type passes through."""
-        pipeline = WhisperXPipeline(device="cpu", compute_type="float32")
-        self.assertEqual(pipeline.compute_type, "float32")
-
-    def test_explicit_float16_passes_through(self):
-        """Test explicit float16 passes through."""
-        pipeline = WhisperXPipeline(device="cuda", compute_type="float16")
-        self.assertEqual(pipeline.compute_type, "float16")
-
-    def test_explicit_int8_passes_through(self):
-        """Test explicit int8 passes through."""
-        pipeline = WhisperXPipeline(device="cpu", compute_type="int8")
-        self.assertEqual(pipeline.compute_type, "int8")
-
-    def test_auto_selects_float16_for_cuda(self):
-        """Test auto selects float16 for cuda device."""
+    def test_explicit_compute_type_passes_through(self):
+        """Test an explicit compute type passes through."""
+        for device, compute_type in (
+            ("cpu", "float32"),
+            ("cuda", "float16"),
+            ("cpu", "int8"),
+        ):
+            with self.subTest(device=device, compute_type=compute_type):
+                pipeline = WhisperXPipeline(device=device, compute_type=compute_type)
+                self.assertEqual(pipeline.compute_type, compute_type)
+
+    def test_compute_type_auto(self):
+        """Test auto selects float16 for cuda and int8 for cpu."""
         pipeline = WhisperXPipeline.__new__(WhisperXPipeline)
-        result = pipeline._resolve_compute_type("auto", "cuda")
-        self.assertEqual(result, "float16")
-
-    def test_auto_selects_int8_for_cpu(self):
-        """Test auto selects int8 for cpu device."""
-        pipeline = WhisperXPipeline.__new__(WhisperXPipeline)
-        result = pipeline._resolve_compute_type("auto", "cpu")
-        self.assertEqual(result, "int8")
+        for device, expected in (("cuda", "float16"), ("cpu", "int8")):
+            with self.subTest(device=device):
+                self.assertEqual(pipeline._resolve_compute_type("auto", device), expected)
 
 
 class TestWhisperXPipelineLazyLoading(unittest.TestCase):
     """Tests for lazy model loading."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build one fake whisperx module for the class; setUp resets its calls."""
+        cls._mock_wx = Mock(spec=_WhisperxSpec)
+        cls._mock_model = Mock()
+        cls._mock_wx.load_model.return_value = cls._mock_model
+        cls._mock_wx.load_align_model.return_value = (Mock(), Mock())
+        cls._mock_wx.DiarizationPipeline.return_value = Mock()
+
+    def setUp(self):
+        # side_effect too: the language-change test installs its own sequence
+        self._mock_wx.reset_mock(side_effect=True)
+        self._patcher = _install_whisperx(self._mock_wx)
+        self._patcher.__enter__()
+
+    def tearDown(self):
+        self._patcher.__exit__(None, None, None)
+
     def test_models_are_none_after_init(self):
         """Test models are None after initialization."""
         pipeline = WhisperXPipeline()
@@ -203,121 +419,66 @@ class TestWhisperXPipelineLazyLoading(unittest.TestCase):
 
     def test_whisper_model_loaded_only_once(self):
         """Test whisper model is loaded only once."""
-        # Create mock whisperx module
-        mock_whisperx = Mock()
-        mock_model = Mock()
-        mock_whisperx.load_model.return_value = mock_model
-
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu")
-            pipeline._load_whisper_model()
-            pipeline._load_whisper_model()  # Second call
+        pipeline = WhisperXPipeline(device="cpu")
+        pipeline._load_whisper_model()
+        pipeline._load_whisper_model()  # Second call
 
         # Should only be called once
-        self.assertEqual(mock_whisperx.load_model.call_count, 1)
-        self.assertEqual(pipeline._whisper_model, mock_model)
+        self.assertEqual(self._mock_wx.load_model.call_count, 1)
+        self.assertEqual(pipeline._whisper_model, self._mock_model)
 
     def test_align_model_reloads_on_language_change(self):
         """Test align model reloads when language changes."""
-        mock_whisperx = Mock()
         mock_model_en = (Mock(), Mock())
         mock_model_fr = (Mock(), Mock())
-        mock_whisperx.load_align_model.side_effect = [mock_model_en, mock_model_fr]
+        self._mock_wx.load_align_model.side_effect = [mock_model_en, mock_model_fr]
 
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu")
-            pipeline._load_align_model("en")
-            pipeline._load_align_model("fr")  # Different language
+        pipeline = WhisperXPipeline(device="cpu")
+        pipeline._load_align_model("en")
+        pipeline._load_align_model("fr")  # Different language
 
         # Should be called twice for different languages
-        self.assertEqual(mock_whisperx.load_align_model.call_count, 2)
+        self.assertEqual(self._mock_wx.load_align_model.call_count, 2)
 
     def test_align_model_not_reloaded_for_same_language(self):
         """Test align model is not reloaded for same language."""
-        mock_whisperx = Mock()
-        mock_model = (Mock(), Mock())
-        mock_whisperx.load_align_model.return_value = mock_model
-
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu")
-            pipeline._load_align_model("en")
-            pipeline._load_align_model("en")  # Same language
+        pipeline = WhisperXPipeline(device="cpu")
+        pipeline._load_align_model("en")
+        pipeline._load_align_model("en")  # Same language
 
         # Should only be called once
-        self.assertEqual(mock_whisperx.load_align_model.call_count, 1)
+        self.assertEqual(self._mock_wx.load_align_model.call_count, 1)
 
     def test_diarize_model_loaded_only_once(self):
         """Test diarize model is loaded only once."""
-        mock_whisperx = Mock()
-        mock_diarize_pipeline = Mock()
-        mock_whisperx.DiarizationPipeline.return_value = mock_diarize_pipeline
-
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="token")
-            pipeline._load_diarize_model()
-            pipeline._load_diarize_model()  # Second call
+        pipeline = WhisperXPipeline(device="cpu", hf_token="token")
+        pipeline._load_diarize_model()
+        pipeline._load_diarize_model()  # Second call
 
         # Should only be called once
-        self.assertEqual(mock_whisperx.DiarizationPipeline.call_count, 1)
+        self.assertEqual(self._mock_wx.DiarizationPipeline.call_count, 1)
 
 
+@unittest.skipIf(
+    os.environ.get("CESAR_SKIP_HEAVY_TESTS") == "1",
+    "heavy mocks disabled (CESAR_SKIP_HEAVY_TESTS=1)",
+)
 class TestWhisperXPipelineTranscription(unittest.TestCase):
     """Tests for transcription pipeline."""
 
-    def _create_mock_whisperx(self):
-        """Create a fully mocked whisperx module."""
-        mock_whisperx = Mock()
-
-        # Mock audio loading - return numpy-like array
-        mock_audio = MagicMock()
-        mock_audio.__len__ = Mock(return_value=160000)  # 10 seconds at 16kHz
-        mock_whisperx.load_audio.return_value = mock_audio
-
-        # Mock transcription
-        mock_model = Mock()
-        mock_model.transcribe.return_value = {
-            "language": "en",
-            "segments": [
-                {"start": 0.0, "end": 5.0, "text": "Hello there."},
-                {"start": 5.0, "end": 10.0, "text": "How are you?"}
-            ]
-        }
-        mock_whisperx.load_model.return_value = mock_model
-
-        # Mock alignment
-        mock_align_model = Mock()
-        mock_align_metadata = Mock()
-        mock_whisperx.load_align_model.return_value = (mock_align_model, mock_align_metadata)
-        mock_whisperx.align.return_value = {
-            "segments": [
-                {"start": 0.0, "end": 5.0, "text": "Hello there.", "speaker": "SPEAKER_00"},
-                {"start": 5.0, "end": 10.0, "text": "How are you?", "speaker": "SPEAKER_01"}
-            ]
-        }
-
-        # Mock diarization
-        mock_diarize_pipeline = Mock()
-        mock_diarize_result = Mock()
-        mock_diarize_pipeline.return_value = mock_diarize_result
-        mock_whisperx.DiarizationPipeline.return_value = mock_diarize_pipeline
-
-        # Mock speaker assignment
-        mock_whisperx.assign_word_speakers.return_value = {
-            "segments": [
-                {"start": 0.0, "end": 5.0, "text": "Hello there.", "speaker": "SPEAKER_00"},
-                {"start": 5.0, "end": 10.0, "text": "How are you?", "speaker": "SPEAKER_01"}
-            ]
-        }
+    def setUp(self):
+        """Install a fresh fake whisperx and build the pipeline under test."""
+        self.mock_whisperx = _create_mock_whisperx()
+        self._patcher = _install_whisperx(self.mock_whisperx)
+        self._patcher.__enter__()
+        self.pipeline = WhisperXPipeline(device="cpu", hf_token="token")
 
-        return mock_whisperx
+    def tearDown(self):
+        self._patcher.__exit__(None, None, None)
 
     def test_successful_transcribe_and_diarize(self):
         """Test successful full pipeline execution."""
-        mock_whisperx = self._create_mock_whisperx()
-
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="token")
-            segments, speaker_count, duration = pipeline.transcribe_and_diarize("test.wav")
+        segments, speaker_count, duration = self.pipeline.transcribe_and_diarize("test.wav")
 
         # Verify segments
         self.assertEqual(len(segments), 2)
@@ -334,9 +495,8 @@ class TestWhisperXPipelineTranscription(unittest.TestCase):
 
     def test_multiple_speakers_detected(self):
         """Test multiple speakers are correctly detected."""
-        mock_whisperx = self._create_mock_whisperx()
         # Modify to have 3 speakers
-        mock_whisperx.assign_word_speakers.return_value = {
+        self.mock_whisperx.assign_word_speakers.return_value = {
             "segments": [
                 {"start": 0.0, "end": 3.0, "text": "Hello.", "speaker": "SPEAKER_00"},
                 {"start": 3.0, "end": 6.0, "text": "Hi.", "speaker": "SPEAKER_01"},
@@ -344,27 +504,21 @@ class TestWhisperXPipelineTranscription(unittest.TestCase):
             ]
         }
 
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="token")
-            segments, speaker_count, duration = pipeline.transcribe_and_diarize("test.wav")
+        segments, speaker_count, duration = self.pipeline.transcribe_and_diarize("test.wav")
 
         self.assertEqual(speaker_count, 3)
         self.assertEqual(len(segments), 3)
 
     def test_min_max_speakers_passed_to_diarization(self):
         """Test min/max_speakers are passed to diarization model."""
-        mock_whisperx = self._create_mock_whisperx()
-
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="token")
-            pipeline.transcribe_and_diarize(
-                "test.wav",
-                min_speakers=2,
-                max_speakers=4
-            )
+        self.pipeline.transcribe_and_diarize(
+            "test.wav",
+            min_speakers=2,
+            max_speakers=4
+        )
 
         # Get the diarize pipeline mock and check its call
-        mock_diarize = mock_whisperx.DiarizationPipeline.return_value
+        mock_diarize = self.mock_whisperx.DiarizationPipeline.return_value
         mock_diarize.assert_called_once()
         call_kwargs = mock_diarize.call_args[1]
         self.assertEqual(call_kwargs['min_speakers'], 2)
@@ -372,40 +526,28 @@ class TestWhisperXPipelineTranscription(unittest.TestCase):
 
     def test_default_speaker_range_used(self):
         """Test default min/max speakers (1-5) used when not specified."""
-        mock_whisperx = self._create_mock_whisperx()
+        self.pipeline.transcribe_and_diarize("test.wav")
 
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="token")
-            pipeline.transcribe_and_diarize("test.wav")
-
-        mock_diarize = mock_whisperx.DiarizationPipeline.return_value
+        mock_diarize = self.mock_whisperx.DiarizationPipeline.return_value
         call_kwargs = mock_diarize.call_args[1]
         self.assertEqual(call_kwargs['min_speakers'], 1)
         self.assertEqual(call_kwargs['max_speakers'], 5)
 
     def test_progress_callback_is_called(self):
         """Test progress callback is called during pipeline."""
-        mock_whisperx = self._create_mock_whisperx()
         progress_calls = []
 
         def progress_callback(phase, percent):
             progress_calls.append((phase, percent))
 
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="token")
-            pipeline.transcribe_and_diarize("test.wav", progress_callback=progress_callback)
+        self.pipeline.transcribe_and_diarize("test.wav", progress_callback=progress_callback)
 
         # Verify progress callbacks were made
         self.assertGreater(len(progress_calls), 0)
 
         # Check for expected phases
-        phases = [call[0] for call in progress_calls]
-        self.assertIn("Loading audio...", phases)
-        self.assertIn("Transcribing...", phases)
-        self.assertIn("Aligning timestamps...", phases)
-        self.assertIn("Detecting speakers...", phases)
-        self.assertIn("Assigning speakers...", phases)
-        self.assertIn("Complete", phases)
+        phases = {phase for phase, _ in progress_calls}
+        self.assertLessEqual(_EXPECTED_PHASES, phases)
 
         # Check percentages increase
         percentages = [call[1] for call in progress_calls]
@@ -414,17 +556,14 @@ class TestWhisperXPipelineTranscription(unittest.TestCase):
 
     def test_segment_with_missing_speaker(self):
         """Test segment with missing speaker gets UNKNOWN label."""
-        mock_whisperx = self._create_mock_whisperx()
-        mock_whisperx.assign_word_speakers.return_value = {
+        self.mock_whisperx.assign_word_speakers.return_value = {
             "segments": [
                 {"start": 0.0, "end": 5.0, "text": "No speaker here."}
                 # Note: no "speaker" key
             ]
         }
 
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="token")
-            segments, speaker_count, duration = pipeline.transcribe_and_diarize("test.wav")
+        segments, speaker_count, duration = self.pipeline.transcribe_and_diarize("test.wav")
 
         self.assertEqual(len(segments), 1)
         self.assertEqual(segments[0].speaker, "UNKNOWN")
@@ -432,17 +571,14 @@ class TestWhisperXPipelineTranscription(unittest.TestCase):
 
     def test_empty_text_handled(self):
         """Test segments with empty text are handled."""
-        mock_whisperx = self._create_mock_whisperx()
-        mock_whisperx.assign_word_speakers.return_value = {
+        self.mock_whisperx.assign_word_speakers.return_value = {
             "segments": [
                 {"start": 0.0, "end": 5.0, "speaker": "SPEAKER_00"}
                 # Note: no "text" key
             ]
         }
 
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="token")
-            segments, speaker_count, duration = pipeline.transcribe_and_diarize("test.wav")
+        segments, speaker_count, duration = self.pipeline.transcribe_and_diarize("test.wav")
 
         self.assertEqual(len(segments), 1)
         self.assertEqual(segments[0].text, "")
@@ -451,51 +587,31 @@ class TestWhisperXPipelineTranscription(unittest.TestCase):
 class TestWhisperXPipelineErrors(unittest.TestCase):
     """Tests for error handling."""
 
-    def test_authentication_error_on_401(self):
-        """Test AuthenticationError on 401 from diarization."""
-        mock_whisperx = Mock()
-        mock_whisperx.DiarizationPipeline.side_effect = Exception("401 Unauthorized")
-
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="bad_token")
-            with self.assertRaises(AuthenticationError) as ctx:
-                pipeline._load_diarize_model()
-
-        self.assertIn("HuggingFace authentication failed", str(ctx.exception))
-        self.assertIn("hf.co/settings/tokens", str(ctx.exception))
-
-    def test_authentication_error_on_unauthorized(self):
-        """Test AuthenticationError on Unauthorized message."""
-        mock_whisperx = Mock()
-        mock_whisperx.DiarizationPipeline.side_effect = Exception("Unauthorized access denied")
-
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="bad_token")
-            with self.assertRaises(AuthenticationError):
-                pipeline._load_diarize_model()
-
-    def test_authentication_error_on_access_denied(self):
-        """Test AuthenticationError on access denied message."""
-        mock_whisperx = Mock()
-        mock_whisperx.DiarizationPipeline.side_effect = Exception("You do not have access to this model")
-
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="bad_token")
-            with self.assertRaises(AuthenticationError):
-                pipeline._load_diarize_model()
-
-    def test_diarization_error_on_generic_failure(self):
-        """Test DiarizationError on generic failure."""
-        mock_whisperx = Mock()
-        mock_whisperx.DiarizationPipeline.side_effect = Exception("Network error")
-
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
-            pipeline = WhisperXPipeline(device="cpu", hf_token="token")
-            with self.assertRaises(DiarizationError) as ctx:
-                pipeline._load_diarize_model()
-
-        self.assertIn("Failed to load diarization model", str(ctx.exception))
-        self.assertIn("Network error", str(ctx.exception))
+    def test_error_classification(self):
+        """Test diarization load failures map to AuthenticationError or DiarizationError."""
+        cases = [
+            ("401 Unauthorized", AuthenticationError,
+             ["HuggingFace authentication failed", "hf.co/settings/tokens"]),
+            ("Unauthorized access denied", AuthenticationError, []),
+            ("You do not have access to this model", AuthenticationError, []),
+            ("Network error", DiarizationError,
+             ["Failed to load diarization model", "Network error"]),
+        ]
+        # A failed load leaves _diarize_model unset, so one pipeline serves all cases
+        pipeline = WhisperXPipeline(device="cpu", hf_token="bad_token")
+
+        for msg, expected_error, fragments in cases:
+            with self.subTest(msg=msg):
+                mock_whisperx = Mock(spec=_WhisperxSpec)
+                mock_whisperx.DiarizationPipeline.side_effect = Exception(msg)
+
+                with _install_whisperx(mock_whisperx):
+                    with self.assertRaises(expected_error) as ctx:
+                        pipeline._load_diarize_model()
+
+                self.assertIs(type(ctx.exception), expected_error)
+                for fragment in fragments:
+                    self.assertIn(fragment, str(ctx.exception))
 
     def test_diarization_error_when_whisperx_not_installed(self):
         """Test DiarizationError when whisperx not installed."""
@@ -537,22 +653,15 @@ class TestWhisperXPipelineConvertToSegments(unittest.TestCase):
 
     def test_convert_basic_segments(self):
         """Test converting basic segments."""
-        mock_whisperx = Mock()
+        mock_whisperx = Mock(spec=_WhisperxSpec)
 
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
+        with _install_whisperx(mock_whisperx):
             pipeline = WhisperXPipeline(device="cpu")
 
-            result = {
-                "segments": [
-                    {"start": 0.0, "end": 5.0, "text": "Hello.", "speaker": "SPEAKER_00"},
-                    {"start": 5.0, "end": 10.0, "text": "Hi.", "speaker": "SPEAKER_01"}
-                ]
-            }
-            # Mock audio of 10 seconds (160000 samples at 16kHz)
-            mock_audio = MagicMock()
-            mock_audio.__len__ = Mock(return_value=160000)
+            # Audio of 10 seconds (160000 samples at 16kHz)
+            mock_audio = _FakeAudio(160000)
 
-            segments, speaker_count, duration = pipeline._convert_to_segments(result, mock_audio)
+            segments, speaker_count, duration = pipeline._convert_to_segments(_BASIC_RESULT, mock_audio)
 
         self.assertEqual(len(segments), 2)
         self.assertEqual(segments[0].start, 0.0)
@@ -564,35 +673,27 @@ class TestWhisperXPipelineConvertToSegments(unittest.TestCase):
 
     def test_convert_strips_whitespace_from_text(self):
         """Test that text whitespace is stripped."""
-        mock_whisperx = Mock()
+        mock_whisperx = Mock(spec=_WhisperxSpec)
 
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
+        with _install_whisperx(mock_whisperx):
             pipeline = WhisperXPipeline(device="cpu")
 
-            result = {
-                "segments": [
-                    {"start": 0.0, "end": 5.0, "text": "  Hello.  ", "speaker": "SPEAKER_00"}
-                ]
-            }
-            mock_audio = MagicMock()
-            mock_audio.__len__ = Mock(return_value=80000)
+            mock_audio = _FakeAudio(80000)
 
-            segments, _, _ = pipeline._convert_to_segments(result, mock_audio)
+            segments, _, _ = pipeline._convert_to_segments(_PADDED_TEXT_RESULT, mock_audio)
 
         self.assertEqual(segments[0].text, "Hello.")
 
     def test_convert_empty_segments(self):
         """Test converting empty segments list."""
-        mock_whisperx = Mock()
+        mock_whisperx = Mock(spec=_WhisperxSpec)
 
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
+        with _install_whisperx(mock_whisperx):
             pipeline = WhisperXPipeline(device="cpu")
 
-            result = {"segments": []}
-            mock_audio = MagicMock()
-            mock_audio.__len__ = Mock(return_value=160000)
+            mock_audio = _FakeAudio(160000)
 
-            segments, speaker_count, duration = pipeline._convert_to_segments(result, mock_audio)
+            segments, speaker_count, duration = pipeline._convert_to_segments(_EMPTY_RESULT, mock_audio)
 
         self.assertEqual(len(segments), 0)
         self.assertEqual(speaker_count, 0)
@@ -600,20 +701,18 @@ class TestWhisperXPipelineConvertToSegments(unittest.TestCase):
 
     def test_convert_calculates_duration_from_audio_length(self):
         """Test duration is calculated from audio array length."""
-        mock_whisperx = Mock()
+        mock_whisperx = Mock(spec=_WhisperxSpec)
 
-        with patch.dict('sys.modules', {'whisperx': mock_whisperx}):
+        with _install_whisperx(mock_whisperx):
             pipeline = WhisperXPipeline(device="cpu")
 
-            result = {"segments": []}
-
-            # Test various durations
+            # Test various durations against the one pipeline and patch scope
             for samples, expected_duration in [(16000, 1.0), (32000, 2.0), (48000, 3.0)]:
-                mock_audio = MagicMock()
-                mock_audio.__len__ = Mock(return_value=samples)
+                with self.subTest(samples=samples):
+                    mock_audio = _FakeAudio(samples)
 
-                _, _, duration = pipeline._convert_to_segments(result, mock_audio)
-                self.assertEqual(duration, expected_duration)
+                    _, _, duration = pipeline._convert_to_segments(_EMPTY_RESULT, mock_audio)
+                    self.assertEqual(duration, expected_duration)
 
 
 if __name__ == "__main__":
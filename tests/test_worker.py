@@ -2,80 +2,339 @@
 Unit tests for BackgroundWorker.
 
 Tests worker behavior: job processing, graceful shutdown, error handling,
-FIFO order, properties, recovery after error, and multiple jobs.
+FIFO order, properties, recovery after error, multiple jobs, and
+diarization outcomes.
+
+Safe under pytest-xdist (``pytest -n auto --dist=loadfile``): the
+shared repository is module-level state, so each worker process
+connects its own, and ``--dist=loadfile`` keeps this file's tests
+together on one worker.
 """
 import asyncio
+import threading
 import unittest
-from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import MappingProxyType
+from unittest.mock import MagicMock, patch
 
 from cesar.api import BackgroundWorker, Job, JobRepository, JobStatus
+# Patched by object below, so patch() never re-resolves the dotted path
+from cesar.api import worker as worker_module
+from cesar.config import CesarConfig
+from cesar.youtube_handler import YouTubeDownloadError
+
+# Read-only orchestrator results shared by the worker tests
+_SIMPLE_RESULT = MappingProxyType({
+    "text": "Hello world",
+    "language": "en",
+    "diarization_succeeded": False,
+    "speaker_count": None
+})
+_HF_TOKEN_REQUIRED_RESULT = MappingProxyType({
+    "text": "Transcribed without speakers",
+    "language": "en",
+    "diarization_succeeded": False,
+    "diarization_error_code": "hf_token_required",
+    "diarization_error": "HuggingFace token required for speaker diarization."
+})
+_HF_TOKEN_INVALID_RESULT = MappingProxyType({
+    "text": "Transcribed without speakers",
+    "language": "en",
+    "diarization_succeeded": False,
+    "diarization_error_code": "hf_token_invalid",
+    "diarization_error": "HuggingFace authentication failed."
+})
+_DIARIZED_RESULT = MappingProxyType({
+    "text": "### Speaker 1\n\nHello\n\n### Speaker 2\n\nHi there",
+    "language": "unknown",
+    "diarization_succeeded": True,
+    "speaker_count": 2
+})
+# diarization_succeeded=False without an error code, as on orchestrator fallback
+_FALLBACK_RESULT = MappingProxyType({
+    "text": "# Transcript\n\n(Speaker detection unavailable)\n\nHello world",
+    "language": "en",
+    "diarization_succeeded": False,
+    "speaker_count": None
+})
+_RETRY_DIARIZED_RESULT = MappingProxyType({
+    "text": "### Speaker 1\n\nRetried with diarization",
+    "language": "unknown",
+    "diarization_succeeded": True,
+    "speaker_count": 1
+})
+
+# Event loop policy in force before setUpModule, restored afterwards
+_previous_policy = None
+
+# In-memory repository connected once in setUpModule and shared by every
+# async test case; aiosqlite resolves each call on the caller's loop, so
+# the per-test event loops can share the connection
+_repo = None
+
+
+def setUpModule():
+    """Select uvloop when installed and connect the shared repository."""
+    global _previous_policy, _repo
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        _previous_policy = asyncio.get_event_loop_policy()
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+    _repo = JobRepository(":memory:")
+
+    async def connect():
+        await _repo.connect()
+        # Durability is irrelevant for a throwaway in-memory database
+        await _repo._connection.execute("PRAGMA journal_mode=MEMORY;")
+        await _repo._connection.execute("PRAGMA synchronous=OFF;")
+        await _repo._connection.execute("PRAGMA temp_store=MEMORY;")
+
+    asyncio.run(connect())
+
+
+def tearDownModule():
+    """Close the shared repository and restore the default loop policy."""
+    asyncio.run(_repo.close())
+    if _previous_policy is not None:
+        asyncio.set_event_loop_policy(_previous_policy)
+
+
+async def _bounded(awaitable, timeout):
+    """Await with a deadline, raising TimeoutError once it passes.
+
+    Uses the asyncio.timeout() scope on Python 3.11+, which avoids the extra
+    task wait_for wraps around the awaitable; falls back to wait_for on 3.10.
+    """
+    if hasattr(asyncio, "timeout"):
+        async with asyncio.timeout(timeout):
+            return await awaitable
+    return await asyncio.wait_for(awaitable, timeout)
+
+
+class _FakeWorker(BackgroundWorker):
+    """BackgroundWorker whose orchestrator call is delegated to orchestrator_impl.
+
+    Tests assign orchestrator_impl directly instead of patching the method;
+    it receives the same positional arguments and runs in the thread pool.
+    """
+
+    orchestrator_impl = None
+
+    def _run_transcription_with_orchestrator(self, *args):
+        return self.orchestrator_impl(*args)
 
 
 class TestBackgroundWorker(unittest.IsolatedAsyncioTestCase):
-    """Test cases for BackgroundWorker behavior."""
-
-    async def asyncSetUp(self):
-        """Set up fresh repository and worker for each test."""
-        self.repo = JobRepository(":memory:")
-        await self.repo.connect()
-        self.worker = BackgroundWorker(self.repo, poll_interval=0.1)
-
-    async def asyncTearDown(self):
-        """Close repository connection after each test."""
-        await self.repo.close()
-
-    async def test_worker_processes_queued_job(self):
-        """Test worker processes a queued job and updates status to COMPLETED."""
-        # Create a job (diarize defaults to True, but we disable to test simple path)
-        job = Job(audio_path="/test/audio.mp3", model_size="base", diarize=False)
-        await self.repo.create(job)
+    """Test cases for BackgroundWorker behavior, diarization outcomes included.
 
-        # Mock _run_transcription_with_orchestrator to return fake result
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            return_value={
-                "text": "Hello world",
-                "language": "en",
-                "diarization_succeeded": False,
-                "speaker_count": None
-            }
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
+    Runs against the module's shared in-memory JobRepository; each test
+    starts from an emptied jobs table and gets a fresh worker.
+    The repository commits every write, so tests are isolated by clearing
+    the table rather than by rolling back a transaction.
+    """
 
-            # Wait briefly for processing
-            await asyncio.sleep(0.3)
+    async def asyncSetUp(self):
+        """Empty the jobs table and create a fresh worker for each test."""
+        self.repo = _repo
+        if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+            # Start created tasks (the worker loop) synchronously up to
+            # their first suspension instead of on the next loop iteration
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        await self.repo._connection.execute("DELETE FROM jobs")
+        await self.repo._connection.commit()
+        # An idle worker re-polls on the next loop iteration instead of a timer
+        self.worker = _FakeWorker(self.repo, poll_interval=0)
+        # New jobs wake the worker immediately rather than on the next poll
+        self.repo.on_create = self.worker.wake
+
+    def _idle_signal(self):
+        """Event set once the worker finds the queue empty and goes idle.
+
+        Wraps the shared repository's get_next_queued for this test only.
+        The worker enters its idle wait in the same step the wrapper
+        returns, so it is parked by the time a waiter on the event resumes.
+        """
+        idle = asyncio.Event()
+        get_next_queued = self.repo.get_next_queued
+
+        async def wrapper():
+            job = await get_next_queued()
+            if job is None:
+                idle.set()
+            return job
+
+        patcher = patch.object(self.repo, 'get_next_queued', new=wrapper)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return idle
+
+    def _signalling(self, handler, expected):
+        """Wrap a mocked side_effect to signal after `expected` calls.
+
+        The wrapped function runs in the worker's thread pool, so the event
+        is set through the loop thread-safely. Calls that raise count too.
+
+        Returns:
+            Tuple of (side_effect, done event)
+        """
+        loop = asyncio.get_running_loop()
+        done = asyncio.Event()
+        calls = []
+
+        def side_effect(*args):
+            calls.append(args)
+            try:
+                return handler(*args)
+            finally:
+                if len(calls) == expected:
+                    loop.call_soon_threadsafe(done.set)
+
+        return side_effect, done
+
+    async def test_job_scenarios(self):
+        """Test single, FIFO, error-recovery and multi-job runs on one running worker.
+
+        The worker only polls when woken, so each scenario's jobs are all
+        queued before it picks the first one up.
+        """
+        self.repo.on_create = None
+        self.worker.poll_interval = 60.0
+
+        def make_jobs(*audio_paths):
+            """Jobs with microsecond-spaced created_at, oldest first."""
+            base = datetime.utcnow()
+            return [
+                Job(audio_path=path, diarize=False, created_at=base + timedelta(microseconds=i))
+                for i, path in enumerate(audio_paths)
+            ]
+
+        async def worker_settled():
+            """Return once the worker has finished its current job."""
+            while self.worker.is_processing:
+                await asyncio.sleep(0)
+
+        async def run_jobs(jobs, side_effect):
+            """Queue jobs in one transaction, wake the worker and wait until it has finished them."""
+            await self.repo._connection.execute("DELETE FROM jobs")
+            await self.repo._connection.commit()
+            self.worker.orchestrator_impl, done = self._signalling(side_effect, len(jobs))
+            await self.repo.create_many(jobs)
+            self.worker.wake()
+            await _bounded(done.wait(), 2.0)
+            # The last job's result is written before the worker goes idle
+            await _bounded(worker_settled(), 1.0)
+
+        def result(text):
+            return lambda *args: {**_SIMPLE_RESULT, "text": text}
 
-            # Shutdown worker
+        worker_task = asyncio.create_task(self.worker.run())
+        try:
+            with self.subTest(name="single_success"):
+                # diarize defaults to True, but we disable to test simple path
+                job = Job(audio_path="/test/audio.mp3", model_size="base", diarize=False)
+                await run_jobs([job], result("Hello world"))
+
+                retrieved = await self.repo.get(job.id)
+                self.assertEqual(retrieved.status, JobStatus.COMPLETED)
+                self.assertEqual(retrieved.result_text, "Hello world")
+                self.assertEqual(retrieved.detected_language, "en")
+                self.assertIsNotNone(retrieved.started_at)
+                self.assertIsNotNone(retrieved.completed_at)
+
+            with self.subTest(name="fifo"):
+                processed_order = []
+
+                def track_order(audio_path, *args):
+                    processed_order.append(audio_path)
+                    return result(f"Transcription of {audio_path}")()
+
+                jobs = make_jobs("/test/audio1.mp3", "/test/audio2.mp3", "/test/audio3.mp3")
+                await run_jobs(jobs, track_order)
+
+                # Oldest first
+                self.assertEqual(
+                    processed_order,
+                    ["/test/audio1.mp3", "/test/audio2.mp3", "/test/audio3.mp3"]
+                )
+
+            with self.subTest(name="error_recovery"):
+                # First job fails, second succeeds
+                call_count = [0]
+
+                def fail_first(*args):
+                    call_count[0] += 1
+                    if call_count[0] == 1:
+                        raise RuntimeError("First job failed")
+                    return result("Second job success")()
+
+                job1, job2 = make_jobs("/test/audio1.mp3", "/test/audio2.mp3")
+                await run_jobs([job1, job2], fail_first)
+
+                job1_retrieved = await self.repo.get(job1.id)
+                self.assertEqual(job1_retrieved.status, JobStatus.ERROR)
+                self.assertIn("First job failed", job1_retrieved.error_message)
+                job2_retrieved = await self.repo.get(job2.id)
+                self.assertEqual(job2_retrieved.status, JobStatus.COMPLETED)
+                self.assertEqual(job2_retrieved.result_text, "Second job success")
+
+            with self.subTest(name="multi_success"):
+                jobs = make_jobs(*(f"/test/audio{i}.mp3" for i in range(3)))
+                await run_jobs(jobs, result("Transcribed"))
+
+                for job in jobs:
+                    retrieved = await self.repo.get(job.id)
+                    self.assertEqual(retrieved.status, JobStatus.COMPLETED)
+                    self.assertEqual(retrieved.result_text, "Transcribed")
+                    self.assertIsNotNone(retrieved.started_at)
+                    self.assertIsNotNone(retrieved.completed_at)
+        finally:
             await self.worker.shutdown()
             await worker_task
 
-        # Verify job was updated to COMPLETED
-        retrieved = await self.repo.get(job.id)
-        self.assertEqual(retrieved.status, JobStatus.COMPLETED)
-        self.assertEqual(retrieved.result_text, "Hello world")
-        self.assertEqual(retrieved.detected_language, "en")
-        self.assertIsNotNone(retrieved.started_at)
-        self.assertIsNotNone(retrieved.completed_at)
-
     async def test_worker_graceful_shutdown(self):
         """Test worker stops gracefully when shutdown is requested."""
+        # Shutdown must interrupt the idle wait, not outlast the poll interval
+        self.worker.poll_interval = 60.0
+        idle = self._idle_signal()
+
         # Start worker (no jobs available)
         worker_task = asyncio.create_task(self.worker.run())
-
-        # Wait briefly
-        await asyncio.sleep(0.05)
+        await _bounded(idle.wait(), 1.0)
 
         # Request shutdown
         await self.worker.shutdown()
 
         # Verify worker stops within timeout
         try:
-            await asyncio.wait_for(worker_task, timeout=1.0)
+            await _bounded(worker_task, 1.0)
         except asyncio.TimeoutError:
             self.fail("Worker did not stop within timeout")
 
+    async def test_worker_wakes_on_create(self):
+        """Test a created job is picked up without waiting out the poll interval."""
+        # Poll interval far longer than the wait below
+        self.worker.poll_interval = 60.0
+        side_effect, done = self._signalling(
+            lambda *args: _SIMPLE_RESULT,
+            expected=1
+        )
+        self.worker.orchestrator_impl = side_effect
+        idle = self._idle_signal()
+        worker_task = asyncio.create_task(self.worker.run())
+        # Let the worker find the queue empty and go idle
+        await _bounded(idle.wait(), 1.0)
+
+        await self.repo.create(Job(audio_path="/test/audio.mp3", diarize=False))
+        await _bounded(done.wait(), 2.0)
+
+        await self.worker.shutdown()
+        await _bounded(worker_task, 1.0)
+
     async def test_worker_handles_transcription_error(self):
         """Test worker marks job as ERROR when transcription fails."""
         # Create a job
@@ -83,19 +342,20 @@ class TestBackgroundWorker(unittest.IsolatedAsyncioTestCase):
         await self.repo.create(job)
 
         # Mock _run_transcription_with_orchestrator to raise exception
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            side_effect=FileNotFoundError("Audio file not found")
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
+        def fail(*args):
+            raise FileNotFoundError("Audio file not found")
 
-            # Wait briefly for processing
-            await asyncio.sleep(0.3)
+        side_effect, done = self._signalling(fail, expected=1)
+        self.worker.orchestrator_impl = side_effect
+        # Start worker task
+        worker_task = asyncio.create_task(self.worker.run())
 
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
+        # Wait until the mock has run; shutdown lets the job finish
+        await _bounded(done.wait(), 2.0)
+
+        # Shutdown worker
+        await self.worker.shutdown()
+        await worker_task
 
         # Verify job was updated to ERROR
         retrieved = await self.repo.get(job.id)
@@ -105,53 +365,6 @@ class TestBackgroundWorker(unittest.IsolatedAsyncioTestCase):
         self.assertIsNotNone(retrieved.completed_at)
         self.assertIsNone(retrieved.result_text)
 
-    async def test_worker_fifo_order(self):
-        """Test worker processes jobs in FIFO order (oldest first)."""
-        # Create 3 jobs with delays to ensure different timestamps
-        job1 = Job(audio_path="/test/audio1.mp3", diarize=False)
-        await self.repo.create(job1)
-        await asyncio.sleep(0.01)
-
-        job2 = Job(audio_path="/test/audio2.mp3", diarize=False)
-        await self.repo.create(job2)
-        await asyncio.sleep(0.01)
-
-        job3 = Job(audio_path="/test/audio3.mp3", diarize=False)
-        await self.repo.create(job3)
-
-        # Track processing order
-        processed_order = []
-
-        def mock_transcription(audio_path, model_size, diarize, min_speakers, max_speakers, is_retry):
-            processed_order.append(audio_path)
-            return {
-                "text": f"Transcription of {audio_path}",
-                "language": "en",
-                "diarization_succeeded": False,
-                "speaker_count": None
-            }
-
-        # Mock _run_transcription_with_orchestrator
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            side_effect=mock_transcription
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
-
-            # Wait for all jobs to process
-            await asyncio.sleep(0.5)
-
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
-
-        # Verify FIFO order (oldest first)
-        self.assertEqual(len(processed_order), 3)
-        self.assertEqual(processed_order[0], "/test/audio1.mp3")
-        self.assertEqual(processed_order[1], "/test/audio2.mp3")
-        self.assertEqual(processed_order[2], "/test/audio3.mp3")
-
     async def test_worker_is_processing_property(self):
         """Test is_processing and current_job_id properties during processing."""
         # Create a job
@@ -160,40 +373,35 @@ class TestBackgroundWorker(unittest.IsolatedAsyncioTestCase):
 
         # Track property values during processing
         property_checks = []
+        # Holds the mocked transcription open until the checker has looked
+        release = threading.Event()
 
         async def check_properties():
             """Helper to check properties while worker is running."""
-            await asyncio.sleep(0.15)  # Wait for job to start processing
+            while not self.worker.is_processing:
+                await asyncio.sleep(0)
             property_checks.append({
                 "is_processing": self.worker.is_processing,
                 "current_job_id": self.worker.current_job_id
             })
+            release.set()
 
-        # Mock _run_transcription_with_orchestrator to sleep briefly
+        # Mock _run_transcription_with_orchestrator to block until released
         def mock_transcription(audio_path, model_size, diarize, min_speakers, max_speakers, is_retry):
-            import time
-            time.sleep(0.2)  # Simulate processing
-            return {
-                "text": "Hello",
-                "language": "en",
-                "diarization_succeeded": False,
-                "speaker_count": None
-            }
-
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            side_effect=mock_transcription
-        ):
-            # Start worker and property checker
-            worker_task = asyncio.create_task(self.worker.run())
-            checker_task = asyncio.create_task(check_properties())
+            release.wait(timeout=1.0)
+            return _SIMPLE_RESULT
 
-            # Wait for checker to complete
-            await checker_task
+        self.worker.orchestrator_impl = mock_transcription
+        # Start worker and property checker
+        worker_task = asyncio.create_task(self.worker.run())
+        checker_task = asyncio.create_task(check_properties())
 
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
+        # Wait for checker to complete
+        await _bounded(checker_task, 2.0)
+
+        # Shutdown worker
+        await self.worker.shutdown()
+        await worker_task
 
         # Verify properties were set during processing
         self.assertEqual(len(property_checks), 1)
@@ -204,96 +412,9 @@ class TestBackgroundWorker(unittest.IsolatedAsyncioTestCase):
         self.assertFalse(self.worker.is_processing)
         self.assertIsNone(self.worker.current_job_id)
 
-    async def test_worker_continues_after_error(self):
-        """Test worker continues processing after a job fails."""
-        # Create 2 jobs
-        job1 = Job(audio_path="/test/audio1.mp3", diarize=False)
-        await self.repo.create(job1)
-        await asyncio.sleep(0.01)
-
-        job2 = Job(audio_path="/test/audio2.mp3", diarize=False)
-        await self.repo.create(job2)
-
-        # Mock: first job fails, second succeeds
-        call_count = [0]
-
-        def mock_transcription(audio_path, model_size, diarize, min_speakers, max_speakers, is_retry):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                raise RuntimeError("First job failed")
-            return {
-                "text": "Second job success",
-                "language": "en",
-                "diarization_succeeded": False,
-                "speaker_count": None
-            }
-
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            side_effect=mock_transcription
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
-
-            # Wait for both jobs to process
-            await asyncio.sleep(0.5)
-
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
-
-        # Verify first job failed
-        job1_retrieved = await self.repo.get(job1.id)
-        self.assertEqual(job1_retrieved.status, JobStatus.ERROR)
-        self.assertIn("First job failed", job1_retrieved.error_message)
-
-        # Verify second job succeeded
-        job2_retrieved = await self.repo.get(job2.id)
-        self.assertEqual(job2_retrieved.status, JobStatus.COMPLETED)
-        self.assertEqual(job2_retrieved.result_text, "Second job success")
-
-    async def test_multiple_jobs_queued(self):
-        """Test worker processes multiple queued jobs sequentially."""
-        # Create 3 jobs
-        jobs = []
-        for i in range(3):
-            job = Job(audio_path=f"/test/audio{i}.mp3", diarize=False)
-            await self.repo.create(job)
-            jobs.append(job)
-            await asyncio.sleep(0.01)
-
-        # Mock transcription
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            return_value={
-                "text": "Transcribed",
-                "language": "en",
-                "diarization_succeeded": False,
-                "speaker_count": None
-            }
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
-
-            # Wait for all jobs to process
-            await asyncio.sleep(0.5)
-
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
-
-        # Verify all jobs completed
-        for job in jobs:
-            retrieved = await self.repo.get(job.id)
-            self.assertEqual(retrieved.status, JobStatus.COMPLETED)
-            self.assertEqual(retrieved.result_text, "Transcribed")
-            self.assertIsNotNone(retrieved.started_at)
-            self.assertIsNotNone(retrieved.completed_at)
-
-    async def test_worker_processes_downloading_job(self):
+    @patch.object(worker_module, 'download_youtube_audio')
+    async def test_worker_processes_downloading_job(self, mock_download):
         """Test worker processes DOWNLOADING job through download and transcription."""
-        from pathlib import Path
-
         # Create a job with DOWNLOADING status
         job = Job(
             audio_path="https://www.youtube.com/watch?v=test",
@@ -306,40 +427,36 @@ class TestBackgroundWorker(unittest.IsolatedAsyncioTestCase):
 
         # Mock download_youtube_audio to return a path
         mock_download_path = Path("/tmp/downloaded_audio.m4a")
+        mock_download.return_value = mock_download_path
 
-        with patch('cesar.api.worker.download_youtube_audio', return_value=mock_download_path):
-            with patch.object(
-                self.worker, '_run_transcription_with_orchestrator',
-                return_value={
-                    "text": "YouTube transcription",
-                    "language": "en",
-                    "diarization_succeeded": False,
-                    "speaker_count": None
-                }
-            ):
-                # Start worker task
-                worker_task = asyncio.create_task(self.worker.run())
+        side_effect, done = self._signalling(
+            lambda *args: _SIMPLE_RESULT,
+            expected=1
+        )
+        self.worker.orchestrator_impl = side_effect
+        # Start worker task
+        worker_task = asyncio.create_task(self.worker.run())
 
-                # Wait for processing
-                await asyncio.sleep(0.3)
+        # Wait until the mock has run; shutdown lets the job finish
+        await _bounded(done.wait(), 2.0)
 
-                # Shutdown worker
-                await self.worker.shutdown()
-                await worker_task
+        # Shutdown worker
+        await self.worker.shutdown()
+        await worker_task
 
         # Verify job transitions: DOWNLOADING -> PROCESSING -> COMPLETED
+        mock_download.assert_called_once_with("https://www.youtube.com/watch?v=test")
         retrieved = await self.repo.get(job.id)
         self.assertEqual(retrieved.status, JobStatus.COMPLETED)
         self.assertEqual(retrieved.download_progress, 100)
         self.assertEqual(retrieved.audio_path, str(mock_download_path))
-        self.assertEqual(retrieved.result_text, "YouTube transcription")
+        self.assertEqual(retrieved.result_text, _SIMPLE_RESULT["text"])
         self.assertIsNotNone(retrieved.started_at)
         self.assertIsNotNone(retrieved.completed_at)
 
-    async def test_worker_downloading_error_sets_error_status(self):
+    @patch.object(worker_module, 'download_youtube_audio')
+    async def test_worker_downloading_error_sets_error_status(self, mock_download):
         """Test worker sets ERROR status when YouTube download fails."""
-        from cesar.youtube_handler import YouTubeDownloadError
-
         # Create a job with DOWNLOADING status
         job = Job(
             audio_path="https://www.youtube.com/watch?v=invalid",
@@ -351,16 +468,20 @@ class TestBackgroundWorker(unittest.IsolatedAsyncioTestCase):
         await self.repo.create(job)
 
         # Mock download to fail
-        with patch('cesar.api.worker.download_youtube_audio', side_effect=YouTubeDownloadError("Video unavailable")):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
+        def fail(url):
+            raise YouTubeDownloadError("Video unavailable")
 
-            # Wait for processing
-            await asyncio.sleep(0.3)
+        mock_download.side_effect, done = self._signalling(fail, expected=1)
 
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
+        # Start worker task
+        worker_task = asyncio.create_task(self.worker.run())
+
+        # Wait until the mock has run; shutdown lets the job finish
+        await _bounded(done.wait(), 2.0)
+
+        # Shutdown worker
+        await self.worker.shutdown()
+        await worker_task
 
         # Verify job marked as ERROR with message
         retrieved = await self.repo.get(job.id)
@@ -380,381 +501,214 @@ class TestBackgroundWorker(unittest.IsolatedAsyncioTestCase):
         self.assertIsNone(job.download_progress)
 
         # Mock transcription
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            return_value={
-                "text": "Regular transcription",
-                "language": "en",
-                "diarization_succeeded": False,
-                "speaker_count": None
-            }
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
+        side_effect, done = self._signalling(
+            lambda *args: _SIMPLE_RESULT,
+            expected=1
+        )
+        self.worker.orchestrator_impl = side_effect
+        # Start worker task
+        worker_task = asyncio.create_task(self.worker.run())
 
-            # Wait for processing
-            await asyncio.sleep(0.3)
+        # Wait until the mock has run; shutdown lets the job finish
+        await _bounded(done.wait(), 2.0)
 
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
+        # Shutdown worker
+        await self.worker.shutdown()
+        await worker_task
 
         # Verify job completed normally
         retrieved = await self.repo.get(job.id)
         self.assertEqual(retrieved.status, JobStatus.COMPLETED)
-        self.assertEqual(retrieved.result_text, "Regular transcription")
+        self.assertEqual(retrieved.result_text, _SIMPLE_RESULT["text"])
         self.assertIsNone(retrieved.download_progress)  # Should remain None for regular jobs
         self.assertIsNotNone(retrieved.started_at)
         self.assertIsNotNone(retrieved.completed_at)
 
+    async def test_diarization_outcomes(self):
+        """Test each diarization outcome maps to the right job status and fields.
+
+        All jobs are queued together and drained by a single worker run; the
+        mocked orchestrator looks up each job's result by its audio path.
+        """
+        # (name, job fields, orchestrator result, expected job fields)
+        cases = [
+            (
+                "diarize_disabled_completes_normally",
+                {"diarize": False},
+                _SIMPLE_RESULT,
+                {
+                    "status": JobStatus.COMPLETED,
+                    "result_text": _SIMPLE_RESULT["text"],
+                    "diarized": False,
+                    "speaker_count": None
+                },
+            ),
+            (
+                "diarize_enabled_no_hf_token_sets_partial",
+                {"diarize": True},
+                _HF_TOKEN_REQUIRED_RESULT,
+                {
+                    "status": JobStatus.PARTIAL,
+                    "result_text": _HF_TOKEN_REQUIRED_RESULT["text"],
+                    "diarization_error_code": "hf_token_required",
+                    "diarization_error": _HF_TOKEN_REQUIRED_RESULT["diarization_error"],
+                    "diarized": False
+                },
+            ),
+            (
+                "diarize_enabled_success",
+                {"diarize": True, "min_speakers": 2, "max_speakers": 4},
+                _DIARIZED_RESULT,
+                {
+                    "status": JobStatus.COMPLETED,
+                    "result_text": _DIARIZED_RESULT["text"],
+                    "diarized": True,
+                    "speaker_count": 2
+                },
+            ),
+            (
+                "diarize_fallback_sets_partial",
+                {"diarize": True},
+                _FALLBACK_RESULT,
+                {
+                    "status": JobStatus.PARTIAL,
+                    "result_text": _FALLBACK_RESULT["text"],
+                    "diarized": False,
+                    "diarization_error_code": "diarization_failed"
+                },
+            ),
+            (
+                "diarize_authentication_error_sets_partial",
+                {"diarize": True},
+                _HF_TOKEN_INVALID_RESULT,
+                {
+                    "status": JobStatus.PARTIAL,
+                    "result_text": _HF_TOKEN_INVALID_RESULT["text"],
+                    "diarization_error_code": "hf_token_invalid",
+                    "diarized": False
+                },
+            ),
+            (
+                # Job has result_text but diarization_error from a partial failure
+                "retry_job_detection",
+                {
+                    "diarize": True,
+                    "result_text": "Previous transcription",
+                    "diarization_error": "HF token was missing",
+                    "diarization_error_code": "hf_token_required"
+                },
+                _RETRY_DIARIZED_RESULT,
+                {
+                    "status": JobStatus.COMPLETED,
+                    "result_text": _RETRY_DIARIZED_RESULT["text"],
+                    "diarized": True
+                },
+            ),
+        ]
+
+        jobs = [
+            Job(audio_path=f"/test/{name}.mp3", model_size="base", **fields)
+            for name, fields, _, _ in cases
+        ]
+        results_by_path = {job.audio_path: result for job, (_, _, result, _) in zip(jobs, cases)}
+        retry_by_path = {}
 
-class TestBackgroundWorkerTranscription(unittest.TestCase):
-    """Test cases for _run_transcription method."""
-
-    @patch('cesar.api.worker.AudioTranscriber')
-    def test_run_transcription_success(self, mock_transcriber_class):
-        """Test _run_transcription creates temp file and calls transcriber."""
-        # Mock transcriber instance
-        mock_transcriber = MagicMock()
-        mock_transcriber.transcribe_file.return_value = {
-            "language": "en",
-            "audio_duration": 10.0
-        }
-        mock_transcriber_class.return_value = mock_transcriber
-
-        # Create worker (no need for real repo)
-        worker = BackgroundWorker(repository=MagicMock(), poll_interval=1.0)
-
-        # Mock file operations
-        with patch('builtins.open', unittest.mock.mock_open(read_data='Test transcription')):
-            with patch('tempfile.mkstemp', return_value=(1, '/tmp/test.txt')):
-                with patch('os.close'):
-                    with patch('pathlib.Path.unlink'):
-                        result = worker._run_transcription('/test/audio.mp3', 'base')
-
-        # Verify result
-        self.assertEqual(result["text"], "Test transcription")
-        self.assertEqual(result["language"], "en")
-
-        # Verify transcriber was called
-        mock_transcriber_class.assert_called_once_with(model_size='base')
-        mock_transcriber.transcribe_file.assert_called_once()
-
-    @patch('cesar.api.worker.AudioTranscriber')
-    def test_run_transcription_cleans_up_temp_file(self, mock_transcriber_class):
-        """Test _run_transcription cleans up temp file even on error."""
-        # Mock transcriber to raise exception
-        mock_transcriber = MagicMock()
-        mock_transcriber.transcribe_file.side_effect = RuntimeError("Transcription failed")
-        mock_transcriber_class.return_value = mock_transcriber
-
-        worker = BackgroundWorker(repository=MagicMock(), poll_interval=1.0)
-
-        # Mock file operations
-        mock_unlink = MagicMock()
-        with patch('tempfile.mkstemp', return_value=(1, '/tmp/test.txt')):
-            with patch('os.close'):
-                with patch('pathlib.Path.unlink', mock_unlink):
-                    with self.assertRaises(RuntimeError):
-                        worker._run_transcription('/test/audio.mp3', 'base')
-
-        # Verify temp file was cleaned up despite error
-        mock_unlink.assert_called_once()
-
-
-class TestBackgroundWorkerDiarization(unittest.IsolatedAsyncioTestCase):
-    """Test cases for worker diarization functionality."""
-
-    async def asyncSetUp(self):
-        """Set up fresh repository and worker for each test."""
-        self.repo = JobRepository(":memory:")
-        await self.repo.connect()
-        self.worker = BackgroundWorker(self.repo, poll_interval=0.1)
-
-    async def asyncTearDown(self):
-        """Close repository connection after each test."""
-        await self.repo.close()
-
-    async def test_diarize_disabled_completes_normally(self):
-        """Test job with diarize=False completes with COMPLETED status."""
-        # Create job with diarization disabled
-        job = Job(audio_path="/test/audio.mp3", model_size="base", diarize=False)
-        await self.repo.create(job)
-
-        # Mock _run_transcription_with_orchestrator to return simple result
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            return_value={
-                "text": "Hello world",
-                "language": "en",
-                "diarization_succeeded": False,
-                "speaker_count": None
-            }
+        def mock_transcription_with_orchestrator(
+            audio_path, model_size, diarize, min_speakers, max_speakers, is_retry
         ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
+            retry_by_path[audio_path] = is_retry
+            return results_by_path[audio_path]
 
-            # Wait for processing
-            await asyncio.sleep(0.3)
+        await self.repo.create_many(jobs)
 
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
+        side_effect, done = self._signalling(mock_transcription_with_orchestrator, expected=len(jobs))
+        self.worker.orchestrator_impl = side_effect
+        worker_task = asyncio.create_task(self.worker.run())
 
-        # Verify job completed
-        retrieved = await self.repo.get(job.id)
-        self.assertEqual(retrieved.status, JobStatus.COMPLETED)
-        self.assertEqual(retrieved.result_text, "Hello world")
-        self.assertEqual(retrieved.diarized, False)
-        self.assertIsNone(retrieved.speaker_count)
-
-    async def test_diarize_enabled_no_hf_token_sets_partial(self):
-        """Test job with diarize=True but no HF token sets PARTIAL status."""
-        # Create job with diarization enabled
-        job = Job(audio_path="/test/audio.mp3", model_size="base", diarize=True)
-        await self.repo.create(job)
+        # Wait until every job has run; shutdown lets the last one finish
+        await _bounded(done.wait(), 2.0)
 
-        # Mock _run_transcription_with_orchestrator to return hf_token_required error
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            return_value={
-                "text": "Transcribed without speakers",
-                "language": "en",
-                "diarization_succeeded": False,
-                "diarization_error_code": "hf_token_required",
-                "diarization_error": "HuggingFace token required for speaker diarization."
-            }
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
+        await self.worker.shutdown()
+        await worker_task
 
-            # Wait for processing
-            await asyncio.sleep(0.3)
+        for job, (name, _, _, expected) in zip(jobs, cases):
+            with self.subTest(name=name):
+                retrieved = await self.repo.get(job.id)
+                for field, value in expected.items():
+                    self.assertEqual(getattr(retrieved, field), value, field)
+                # Only the job carrying a previous partial result is a retry
+                self.assertEqual(retry_by_path[job.audio_path], name == "retry_job_detection")
 
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
-
-        # Verify job is PARTIAL with transcription but diarization error
-        retrieved = await self.repo.get(job.id)
-        self.assertEqual(retrieved.status, JobStatus.PARTIAL)
-        self.assertEqual(retrieved.result_text, "Transcribed without speakers")
-        self.assertEqual(retrieved.diarization_error_code, "hf_token_required")
-        self.assertIsNotNone(retrieved.diarization_error)
-        self.assertEqual(retrieved.diarized, False)
-
-    async def test_diarize_enabled_success(self):
-        """Test job with diarize=True and successful diarization."""
-        # Create job with diarization enabled and speaker range
-        job = Job(
-            audio_path="/test/audio.mp3",
-            model_size="base",
-            diarize=True,
-            min_speakers=2,
-            max_speakers=4
-        )
-        await self.repo.create(job)
 
-        # Mock _run_transcription_with_orchestrator to return success
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            return_value={
-                "text": "### Speaker 1\n\nHello\n\n### Speaker 2\n\nHi there",
-                "language": "unknown",
-                "diarization_succeeded": True,
-                "speaker_count": 2
-            }
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
+class _FakeTranscriber:
+    """Plain AudioTranscriber stand-in that writes a fixed transcript."""
 
-            # Wait for processing
-            await asyncio.sleep(0.3)
+    # Every instance constructed, for asserting on constructor arguments
+    instances = []
 
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
+    def __init__(self, model_size):
+        self.model_size = model_size
+        self.transcribed = []
+        _FakeTranscriber.instances.append(self)
 
-        # Verify job is COMPLETED with diarization
-        retrieved = await self.repo.get(job.id)
-        self.assertEqual(retrieved.status, JobStatus.COMPLETED)
-        self.assertIn("Speaker 1", retrieved.result_text)
-        self.assertEqual(retrieved.diarized, True)
-        self.assertEqual(retrieved.speaker_count, 2)
-
-    async def test_diarize_fallback_sets_partial(self):
-        """Test job with diarization failure (orchestrator returns diarization_succeeded=False)."""
-        # Create job with diarization enabled
-        job = Job(audio_path="/test/audio.mp3", model_size="base", diarize=True)
-        await self.repo.create(job)
+    def transcribe_file(self, audio_path, output_path):
+        self.transcribed.append((audio_path, output_path))
+        Path(output_path).write_text('Test transcription', encoding='utf-8')
+        return {"language": "en", "audio_duration": 10.0}
 
-        # Mock _run_transcription_with_orchestrator to return fallback result
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            return_value={
-                "text": "# Transcript\n\n(Speaker detection unavailable)\n\nHello world",
-                "language": "en",
-                "diarization_succeeded": False,
-                "speaker_count": None
-            }
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
 
-            # Wait for processing
-            await asyncio.sleep(0.3)
-
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
-
-        # Verify job is PARTIAL
-        retrieved = await self.repo.get(job.id)
-        self.assertEqual(retrieved.status, JobStatus.PARTIAL)
-        self.assertIn("Hello world", retrieved.result_text)
-        self.assertEqual(retrieved.diarized, False)
-        self.assertEqual(retrieved.diarization_error_code, "diarization_failed")
-
-    async def test_diarize_authentication_error_sets_partial(self):
-        """Test job with invalid HF token sets PARTIAL with hf_token_invalid."""
-        # Create job with diarization enabled
-        job = Job(audio_path="/test/audio.mp3", model_size="base", diarize=True)
-        await self.repo.create(job)
-
-        # Mock _run_transcription_with_orchestrator to return auth error
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            return_value={
-                "text": "Transcribed without speakers",
-                "language": "en",
-                "diarization_succeeded": False,
-                "diarization_error_code": "hf_token_invalid",
-                "diarization_error": "HuggingFace authentication failed."
-            }
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
-
-            # Wait for processing
-            await asyncio.sleep(0.3)
+class TestBackgroundWorkerTranscription(unittest.TestCase):
+    """Test cases for _run_transcription method."""
 
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
+    def setUp(self):
+        """Patch the transcriber; _run_transcription's real temp file is used."""
+        patcher = patch.object(worker_module, 'AudioTranscriber')
+        self.mock_transcriber_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_transcriber = self.mock_transcriber_class.return_value
 
-        # Verify job is PARTIAL with auth error code
-        retrieved = await self.repo.get(job.id)
-        self.assertEqual(retrieved.status, JobStatus.PARTIAL)
-        self.assertEqual(retrieved.result_text, "Transcribed without speakers")
-        self.assertEqual(retrieved.diarization_error_code, "hf_token_invalid")
-        self.assertEqual(retrieved.diarized, False)
-
-    async def test_retry_job_detection(self):
-        """Test retry scenario where job has result_text but diarization_error."""
-        # Create job that simulates a partial failure (has result but error)
-        job = Job(
-            audio_path="/test/audio.mp3",
-            model_size="base",
-            diarize=True,
-            status=JobStatus.QUEUED,
-            result_text="Previous transcription",
-            diarization_error="HF token was missing",
-            diarization_error_code="hf_token_required"
-        )
-        await self.repo.create(job)
+        # Create worker (no need for real repo)
+        self.worker = BackgroundWorker(repository=MagicMock(), poll_interval=1.0)
 
-        # Track is_retry parameter
-        received_params = {}
+    def test_run_transcription_success(self):
+        """Test _run_transcription creates temp file and calls transcriber."""
+        _FakeTranscriber.instances.clear()
 
-        def mock_transcription_with_orchestrator(
-            audio_path, model_size, diarize, min_speakers, max_speakers, is_retry
-        ):
-            received_params['is_retry'] = is_retry
-            return {
-                "text": "### Speaker 1\n\nRetried with diarization",
-                "language": "unknown",
-                "diarization_succeeded": True,
-                "speaker_count": 1
-            }
-
-        with patch.object(
-            self.worker, '_run_transcription_with_orchestrator',
-            side_effect=mock_transcription_with_orchestrator
-        ):
-            # Start worker task
-            worker_task = asyncio.create_task(self.worker.run())
+        with patch.object(worker_module, 'AudioTranscriber', new=_FakeTranscriber):
+            result = self.worker._run_transcription('/test/audio.mp3', 'base')
 
-            # Wait for processing
-            await asyncio.sleep(0.3)
+        # Verify result
+        self.assertEqual(result["text"], "Test transcription")
+        self.assertEqual(result["language"], "en")
 
-            # Shutdown worker
-            await self.worker.shutdown()
-            await worker_task
+        # Verify transcriber was called
+        self.assertEqual(len(_FakeTranscriber.instances), 1)
+        transcriber = _FakeTranscriber.instances[0]
+        self.assertEqual(transcriber.model_size, 'base')
+        self.assertEqual(len(transcriber.transcribed), 1)
 
-        # Verify is_retry was True
-        self.assertTrue(received_params.get('is_retry', False))
+    def test_run_transcription_cleans_up_temp_file(self):
+        """Test _run_transcription cleans up temp file even on error."""
+        self.mock_transcriber.transcribe_file.side_effect = RuntimeError("Transcription failed")
 
-        # Verify job is now COMPLETED with diarization
-        retrieved = await self.repo.get(job.id)
-        self.assertEqual(retrieved.status, JobStatus.COMPLETED)
-        self.assertIn("Retried with diarization", retrieved.result_text)
-        self.assertEqual(retrieved.diarized, True)
+        with self.assertRaises(RuntimeError):
+            self.worker._run_transcription('/test/audio.mp3', 'base')
 
+        # Verify temp file was cleaned up despite error
+        output_path = self.mock_transcriber.transcribe_file.call_args[0][1]
+        self.assertFalse(Path(output_path).exists())
 
-class TestBackgroundWorkerHFTokenResolution(unittest.TestCase):
-    """Test cases for _get_hf_token method."""
 
-    def test_hf_token_from_config(self):
-        """Test HF token resolution from config."""
-        from cesar.config import CesarConfig
+class TestWorkerHFToken(unittest.TestCase):
+    """Test cases for the worker's HF token lookup."""
 
+    def test_worker_delegates_to_resolve_hf_token(self):
+        """Test BackgroundWorker._get_hf_token resolves from the worker's config."""
         config = CesarConfig(hf_token="token_from_config")
-        worker = BackgroundWorker(repository=MagicMock(), config=config)
+        worker = BackgroundWorker(repository=None, config=config)
 
         self.assertEqual(worker._get_hf_token(), "token_from_config")
 
-    def test_hf_token_from_env(self):
-        """Test HF token resolution from environment variable."""
-        worker = BackgroundWorker(repository=MagicMock(), config=None)
-
-        with patch.dict('os.environ', {'HF_TOKEN': 'token_from_env'}):
-            self.assertEqual(worker._get_hf_token(), "token_from_env")
-
-    def test_hf_token_from_cache(self):
-        """Test HF token resolution from cached file."""
-        worker = BackgroundWorker(repository=MagicMock(), config=None)
-
-        # Mock environment to have no HF_TOKEN
-        with patch.dict('os.environ', {}, clear=True):
-            # Mock Path.exists to return True for token file
-            with patch('pathlib.Path.exists', return_value=True):
-                # Mock read_text to return cached token
-                with patch('pathlib.Path.read_text', return_value='token_from_cache\n'):
-                    self.assertEqual(worker._get_hf_token(), "token_from_cache")
-
-    def test_hf_token_none_when_not_found(self):
-        """Test HF token is None when no source available."""
-        worker = BackgroundWorker(repository=MagicMock(), config=None)
-
-        # Mock environment to have no HF_TOKEN
-        with patch.dict('os.environ', {}, clear=True):
-            # Mock Path.exists to return False for token file
-            with patch('pathlib.Path.exists', return_value=False):
-                self.assertIsNone(worker._get_hf_token())
-
-    def test_hf_token_config_priority(self):
-        """Test config token takes priority over env and cache."""
-        from cesar.config import CesarConfig
-
-        config = CesarConfig(hf_token="token_from_config")
-        worker = BackgroundWorker(repository=MagicMock(), config=config)
-
-        with patch.dict('os.environ', {'HF_TOKEN': 'token_from_env'}):
-            with patch('pathlib.Path.exists', return_value=True):
-                with patch('pathlib.Path.read_text', return_value='token_from_cache'):
-                    # Config should take priority
-                    self.assertEqual(worker._get_hf_token(), "token_from_config")
-
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,12 +4,23 @@ Unit tests for youtube_handler module.
 Tests YouTube URL validation, FFmpeg detection, download functionality,
 and temp file cleanup. All yt-dlp operations are mocked to avoid
 real network requests.
+
+Safe under pytest-xdist (``pytest -n auto --dist=loadfile``): the
+module-scoped patches and temp root are per process, ``--dist=loadfile``
+keeps this file's tests together on one worker, and the cleanup tests
+each patch tempfile.gettempdir to their own tmp_path.
 """
+import json
 import tempfile
-import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadError, ExtractorError, PostProcessingError
 
+from cesar import youtube_handler
 from cesar.youtube_handler import (
     FFmpegNotFoundError,
     YouTubeAgeRestrictedError,
@@ -26,684 +37,752 @@ from cesar.youtube_handler import (
     require_ffmpeg,
 )
 
+# Output dir for error-path tests: extract_info raises before yt-dlp
+# writes anything, so the system temp dir is used as-is
+_ERROR_PATH_DIR = Path(tempfile.gettempdir())
+
+
+@pytest.fixture
+def fake_which(monkeypatch, ffmpeg_paths_file):
+    """Plain-function shutil.which with the FFmpeg check cache reset.
+
+    Tests add binary names to ``installed``; ``lookups`` records each call.
+    The opt-in FFmpeg record is enabled at ``paths_file`` (conftest's
+    per-test file).
+    """
+    monkeypatch.setattr(youtube_handler, '_FFMPEG_CACHE', None)
+    fake = SimpleNamespace(
+        installed=set(), lookups=[], paths_file=ffmpeg_paths_file
+    )
+
+    def which(cmd):
+        fake.lookups.append(cmd)
+        return f'/usr/bin/{cmd}' if cmd in fake.installed else None
+
+    monkeypatch.setattr(youtube_handler.shutil, 'which', which)
+    return fake
+
+
+@pytest.fixture(scope="module")
+def download_patches():
+    """Patch require_ffmpeg and YoutubeDL once for the module's download tests."""
+    with patch('cesar.youtube_handler.require_ffmpeg') as mock_require, \
+            patch('yt_dlp.YoutubeDL') as mock_ydl_class:
+        yield mock_require, mock_ydl_class
+
+
+@pytest.fixture
+def mock_require(download_patches):
+    """Module-wide require_ffmpeg patch, reset for the test."""
+    mock_require, _ = download_patches
+    mock_require.reset_mock(side_effect=True)
+    return mock_require
+
+
+@pytest.fixture
+def mock_ydl_class(download_patches):
+    """Module-wide YoutubeDL class patch, with its call history reset."""
+    _, mock_ydl_class = download_patches
+    mock_ydl_class.reset_mock()
+    return mock_ydl_class
+
+
+@pytest.fixture
+def mock_ydl(mock_ydl_class, mock_require):
+    """YoutubeDL instance bound by download_youtube_audio's ``with`` block."""
+    mock_ydl = mock_ydl_class.return_value.__enter__.return_value
+    mock_ydl.reset_mock(return_value=True, side_effect=True)
+    return mock_ydl
+
+
+@pytest.fixture
+def fixed_uuid(monkeypatch):
+    """Make download_youtube_audio name its files 'test.<ext>'."""
+    monkeypatch.setattr(youtube_handler.uuid, 'uuid4', lambda: 'test')
+    return 'test'
+
+
+@pytest.fixture(scope="module")
+def download_root(tmp_path_factory):
+    """One temp root shared by the module's download tests."""
+    return tmp_path_factory.mktemp("youtube")
+
+
+@pytest.fixture
+def output_dir(download_root, request):
+    """Per-test output directory under the shared temp root."""
+    path = download_root / request.node.name
+    path.mkdir()
+    return path
+
+
+# Tests for is_youtube_url function.
+
+
+def test_valid_watch_url():
+    """Test standard YouTube watch URL."""
+    url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+    assert is_youtube_url(url)
+
+
+def test_valid_watch_url_no_www():
+    """Test YouTube watch URL without www prefix."""
+    url = 'https://youtube.com/watch?v=dQw4w9WgXcQ'
+    assert is_youtube_url(url)
+
+
+def test_valid_youtu_be():
+    """Test shortened youtu.be URL."""
+    url = 'https://youtu.be/dQw4w9WgXcQ'
+    assert is_youtube_url(url)
+
+
+def test_valid_shorts():
+    """Test YouTube Shorts URL."""
+    url = 'https://www.youtube.com/shorts/abc123XYZ'
+    assert is_youtube_url(url)
+
+
+def test_valid_embed():
+    """Test YouTube embed URL."""
+    url = 'https://www.youtube.com/embed/dQw4w9WgXcQ'
+    assert is_youtube_url(url)
+
+
+def test_valid_v_url():
+    """Test YouTube /v/ URL format."""
+    url = 'https://www.youtube.com/v/dQw4w9WgXcQ'
+    assert is_youtube_url(url)
+
+
+def test_valid_e_url():
+    """Test legacy YouTube /e/ embed URL format."""
+    url = 'https://www.youtube.com/e/dQw4w9WgXcQ'
+    assert is_youtube_url(url)
+
+
+def test_invalid_vimeo():
+    """Test Vimeo URL returns False."""
+    url = 'https://vimeo.com/123456'
+    assert not is_youtube_url(url)
+
+
+def test_invalid_random_url():
+    """Test random website URL returns False."""
+    url = 'https://example.com/video/123'
+    assert not is_youtube_url(url)
+
+
+def test_empty_url():
+    """Test empty string returns False."""
+    assert not is_youtube_url('')
+
 
-class TestIsYouTubeUrl(unittest.TestCase):
-    """Tests for is_youtube_url function."""
+def test_none_url():
+    """Test None returns False."""
+    assert not is_youtube_url(None)
 
-    def test_valid_watch_url(self):
-        """Test standard YouTube watch URL."""
-        url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
-        self.assertTrue(is_youtube_url(url))
 
-    def test_valid_watch_url_no_www(self):
-        """Test YouTube watch URL without www prefix."""
-        url = 'https://youtube.com/watch?v=dQw4w9WgXcQ'
-        self.assertTrue(is_youtube_url(url))
+def test_url_with_whitespace():
+    """Test URL with leading/trailing whitespace is handled."""
+    url = '  https://youtube.com/watch?v=abc123  '
+    assert is_youtube_url(url)
 
-    def test_valid_youtu_be(self):
-        """Test shortened youtu.be URL."""
-        url = 'https://youtu.be/dQw4w9WgXcQ'
-        self.assertTrue(is_youtube_url(url))
 
-    def test_valid_shorts(self):
-        """Test YouTube Shorts URL."""
-        url = 'https://www.youtube.com/shorts/abc123XYZ'
-        self.assertTrue(is_youtube_url(url))
+def test_http_url():
+    """Test HTTP (non-HTTPS) URL is accepted."""
+    url = 'http://youtube.com/watch?v=abc123'
+    assert is_youtube_url(url)
 
-    def test_valid_embed(self):
-        """Test YouTube embed URL."""
-        url = 'https://www.youtube.com/embed/dQw4w9WgXcQ'
-        self.assertTrue(is_youtube_url(url))
 
-    def test_valid_v_url(self):
-        """Test YouTube /v/ URL format."""
-        url = 'https://www.youtube.com/v/dQw4w9WgXcQ'
-        self.assertTrue(is_youtube_url(url))
+def test_overlong_url_rejected():
+    """Test a URL over the length cap is rejected without parsing."""
+    url = 'https://youtube.com/watch?v=abc123&x=' + '_' * 100_000
+    assert not is_youtube_url(url)
 
-    def test_invalid_vimeo(self):
-        """Test Vimeo URL returns False."""
-        url = 'https://vimeo.com/123456'
-        self.assertFalse(is_youtube_url(url))
 
-    def test_invalid_random_url(self):
-        """Test random website URL returns False."""
-        url = 'https://example.com/video/123'
-        self.assertFalse(is_youtube_url(url))
+def test_url_check_is_cached():
+    """Test repeat validation of the same URL is served from the cache."""
+    youtube_handler._has_youtube_prefix.cache_clear()
+    url = 'https://www.youtube.com/watch?v=cache123456'
 
-    def test_empty_url(self):
-        """Test empty string returns False."""
-        self.assertFalse(is_youtube_url(''))
+    assert is_youtube_url(url)
+    assert is_youtube_url(url)
 
-    def test_none_url(self):
-        """Test None returns False."""
-        self.assertFalse(is_youtube_url(None))
+    info = youtube_handler._has_youtube_prefix.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
 
-    def test_url_with_whitespace(self):
-        """Test URL with leading/trailing whitespace is handled."""
-        url = '  https://youtube.com/watch?v=abc123  '
-        self.assertTrue(is_youtube_url(url))
 
-    def test_http_url(self):
-        """Test HTTP (non-HTTPS) URL is accepted."""
-        url = 'http://youtube.com/watch?v=abc123'
-        self.assertTrue(is_youtube_url(url))
+# Tests for check_ffmpeg_available function.
 
 
-class TestCheckFfmpegAvailable(unittest.TestCase):
-    """Tests for check_ffmpeg_available function."""
+def test_ffmpeg_available(fake_which):
+    """Test returns (True, '') when both ffmpeg and ffprobe found."""
+    fake_which.installed.update(('ffmpeg', 'ffprobe'))
 
-    def setUp(self):
-        """Clear cache before each test."""
-        check_ffmpeg_available.cache_clear()
+    available, error = check_ffmpeg_available()
 
-    def tearDown(self):
-        """Clear cache after each test."""
-        check_ffmpeg_available.cache_clear()
+    assert available
+    assert error == ''
 
-    @patch('cesar.youtube_handler.shutil.which')
-    def test_ffmpeg_available(self, mock_which):
-        """Test returns (True, '') when both ffmpeg and ffprobe found."""
-        mock_which.side_effect = lambda x: f'/usr/bin/{x}'
 
-        available, error = check_ffmpeg_available()
+def test_ffmpeg_missing(fake_which):
+    """Test returns (False, error_msg) when ffmpeg not found."""
+    available, error = check_ffmpeg_available()
 
-        self.assertTrue(available)
-        self.assertEqual(error, '')
+    assert not available
+    assert 'FFmpeg not found' in error
+    assert 'pacman' in error  # Check install instructions
 
-    @patch('cesar.youtube_handler.shutil.which')
-    def test_ffmpeg_missing(self, mock_which):
-        """Test returns (False, error_msg) when ffmpeg not found."""
-        mock_which.return_value = None
 
-        available, error = check_ffmpeg_available()
+def test_ffprobe_missing(fake_which):
+    """Test returns (False, error_msg) when ffprobe not found."""
+    fake_which.installed.add('ffmpeg')
 
-        self.assertFalse(available)
-        self.assertIn('FFmpeg not found', error)
-        self.assertIn('pacman', error)  # Check install instructions
+    available, error = check_ffmpeg_available()
 
-    @patch('cesar.youtube_handler.shutil.which')
-    def test_ffprobe_missing(self, mock_which):
-        """Test returns (False, error_msg) when ffprobe not found."""
-        def which_side_effect(cmd):
-            return '/usr/bin/ffmpeg' if cmd == 'ffmpeg' else None
+    assert not available
+    assert 'FFprobe not found' in error
 
-        mock_which.side_effect = which_side_effect
 
-        available, error = check_ffmpeg_available()
+def test_result_is_cached(fake_which):
+    """Test check result is cached after first call."""
+    fake_which.installed.update(('ffmpeg', 'ffprobe'))
 
-        self.assertFalse(available)
-        self.assertIn('FFprobe not found', error)
+    # First call
+    check_ffmpeg_available()
+    # Second call
+    check_ffmpeg_available()
 
-    @patch('cesar.youtube_handler.shutil.which')
-    def test_result_is_cached(self, mock_which):
-        """Test check result is cached after first call."""
-        mock_which.side_effect = lambda x: f'/usr/bin/{x}'
+    # shutil.which should only be called twice (once for ffmpeg, once for ffprobe)
+    # on the first check_ffmpeg_available call due to caching
+    assert len(fake_which.lookups) == 2
 
-        # First call
-        check_ffmpeg_available()
-        # Second call
-        check_ffmpeg_available()
 
-        # shutil.which should only be called twice (once for ffmpeg, once for ffprobe)
-        # on the first check_ffmpeg_available call due to caching
-        self.assertEqual(mock_which.call_count, 2)
+def test_found_binaries_are_recorded(fake_which, monkeypatch):
+    """Test a successful lookup records the binary paths with $PATH."""
+    monkeypatch.setenv('PATH', '/usr/bin')
+    fake_which.installed.update(('ffmpeg', 'ffprobe'))
 
+    check_ffmpeg_available()
 
-class TestRequireFfmpeg(unittest.TestCase):
-    """Tests for require_ffmpeg function."""
+    assert json.loads(fake_which.paths_file.read_text()) == {
+        'path': '/usr/bin',
+        'ffmpeg': '/usr/bin/ffmpeg',
+        'ffprobe': '/usr/bin/ffprobe',
+    }
 
-    def setUp(self):
-        """Clear cache before each test."""
-        check_ffmpeg_available.cache_clear()
 
-    def tearDown(self):
-        """Clear cache after each test."""
-        check_ffmpeg_available.cache_clear()
+def test_record_is_off_by_default(fake_which, monkeypatch):
+    """Test nothing is written when no record file is configured."""
+    monkeypatch.setattr(youtube_handler, '_FFMPEG_PATHS_FILE', None)
+    # Any attempt to write a record would call mkstemp and raise TypeError
+    monkeypatch.setattr(youtube_handler.tempfile, 'mkstemp', None)
+    fake_which.installed.update(('ffmpeg', 'ffprobe'))
 
-    @patch('cesar.youtube_handler.shutil.which')
-    def test_require_ffmpeg_available(self, mock_which):
-        """Test require_ffmpeg does nothing when ffmpeg available."""
-        mock_which.side_effect = lambda x: f'/usr/bin/{x}'
+    assert check_ffmpeg_available() == (True, '')
+    assert fake_which.lookups == ['ffmpeg', 'ffprobe']
 
-        # Should not raise
+
+def test_missing_binaries_are_not_recorded(fake_which):
+    """Test a failed lookup leaves no record, so the next run checks again."""
+    check_ffmpeg_available()
+
+    assert not fake_which.paths_file.exists()
+
+
+def _make_binaries(directory, mode=0o755):
+    """Create empty ffmpeg and ffprobe files with the given mode."""
+    for name in ('ffmpeg', 'ffprobe'):
+        (directory / name).touch(mode=mode)
+
+
+def test_recorded_binaries_skip_lookup(fake_which, monkeypatch, tmp_path):
+    """Test a record matching $PATH with executable binaries skips which()."""
+    monkeypatch.setenv('PATH', str(tmp_path))
+    _make_binaries(tmp_path)
+    fake_which.paths_file.write_text(json.dumps({
+        'path': str(tmp_path),
+        'ffmpeg': str(tmp_path / 'ffmpeg'),
+        'ffprobe': str(tmp_path / 'ffprobe'),
+    }))
+
+    assert check_ffmpeg_available() == (True, '')
+    assert fake_which.lookups == []
+
+
+@pytest.mark.parametrize("record", [
+    pytest.param({'path': '/elsewhere'}, id="different_path"),
+    pytest.param({'ffmpeg': '/gone/ffmpeg'}, id="binary_removed"),
+    pytest.param(None, id="corrupt"),
+])
+def test_stale_record_falls_back_to_lookup(fake_which, monkeypatch, tmp_path, record):
+    """Test an outdated or unreadable record is ignored."""
+    monkeypatch.setenv('PATH', str(tmp_path))
+    _make_binaries(tmp_path)
+    if record is None:
+        fake_which.paths_file.write_text('{not json')
+    else:
+        fake_which.paths_file.write_text(json.dumps({
+            'path': str(tmp_path),
+            'ffmpeg': str(tmp_path / 'ffmpeg'),
+            'ffprobe': str(tmp_path / 'ffprobe'),
+            **record,
+        }))
+
+    available, _ = check_ffmpeg_available()
+
+    assert not available
+    assert fake_which.lookups == ['ffmpeg', 'ffprobe']
+
+
+def test_non_executable_record_falls_back_to_lookup(fake_which, monkeypatch, tmp_path):
+    """Test a record whose binaries lost their execute bit is ignored."""
+    monkeypatch.setenv('PATH', str(tmp_path))
+    _make_binaries(tmp_path, mode=0o644)
+    fake_which.paths_file.write_text(json.dumps({
+        'path': str(tmp_path),
+        'ffmpeg': str(tmp_path / 'ffmpeg'),
+        'ffprobe': str(tmp_path / 'ffprobe'),
+    }))
+
+    available, _ = check_ffmpeg_available()
+
+    assert not available
+    assert fake_which.lookups == ['ffmpeg', 'ffprobe']
+
+
+# Tests for require_ffmpeg function.
+
+
+def test_require_ffmpeg_available(fake_which):
+    """Test require_ffmpeg does nothing when ffmpeg available."""
+    fake_which.installed.update(('ffmpeg', 'ffprobe'))
+
+    # Should not raise
+    require_ffmpeg()
+
+
+def test_require_ffmpeg_missing_raises(fake_which):
+    """Test require_ffmpeg raises FFmpegNotFoundError when missing."""
+    with pytest.raises(FFmpegNotFoundError) as exc_info:
         require_ffmpeg()
 
-    @patch('cesar.youtube_handler.shutil.which')
-    def test_require_ffmpeg_missing_raises(self, mock_which):
-        """Test require_ffmpeg raises FFmpegNotFoundError when missing."""
-        mock_which.return_value = None
-
-        with self.assertRaises(FFmpegNotFoundError) as ctx:
-            require_ffmpeg()
-
-        self.assertIn('FFmpeg not found', str(ctx.exception))
-
-
-class TestDownloadYouTubeAudio(unittest.TestCase):
-    """Tests for download_youtube_audio function."""
-
-    def setUp(self):
-        """Clear cache before each test."""
-        check_ffmpeg_available.cache_clear()
-
-    def tearDown(self):
-        """Clear cache after each test."""
-        check_ffmpeg_available.cache_clear()
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    def test_invalid_url_raises_error(self, mock_require):
-        """Test invalid URL raises YouTubeURLError."""
-        with self.assertRaises(YouTubeURLError) as ctx:
-            download_youtube_audio('https://vimeo.com/123456')
-
-        self.assertIn('Invalid YouTube URL', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    def test_ffmpeg_missing_raises_error(self, mock_require):
-        """Test FFmpeg missing raises FFmpegNotFoundError."""
-        mock_require.side_effect = FFmpegNotFoundError("FFmpeg not found")
-
-        with self.assertRaises(FFmpegNotFoundError):
-            download_youtube_audio('https://youtube.com/watch?v=test')
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_download_success(self, mock_ydl_class, mock_require):
-        """Test successful download returns path to audio file."""
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.return_value = {'title': 'Test Video'}
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            # Create a fake output file
-            test_file = temp_path / 'test.m4a'
-
-            # Patch uuid to return predictable value
-            with patch('cesar.youtube_handler.uuid.uuid4', return_value='test'):
-                # Create the expected output file
-                (temp_path / 'test.m4a').touch()
-
-                result = download_youtube_audio(
-                    'https://youtube.com/watch?v=abc123',
-                    output_dir=temp_path
-                )
-
-            self.assertEqual(result, temp_path / 'test.m4a')
-            mock_ydl.extract_info.assert_called_once()
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_download_error_403_raises_rate_limit(self, mock_ydl_class, mock_require):
-        """Test 403 error raises YouTubeRateLimitError."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError("HTTP Error 403: Forbidden")
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeRateLimitError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=test',
-                    output_dir=Path(temp_dir)
-                )
-
-            self.assertIn('limiting', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_download_error_429_raises_rate_limit(self, mock_ydl_class, mock_require):
-        """Test 429 error raises YouTubeRateLimitError."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError("HTTP Error 429: Too Many Requests")
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeRateLimitError):
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=test',
-                    output_dir=Path(temp_dir)
-                )
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_download_error_unavailable(self, mock_ydl_class, mock_require):
-        """Test unavailable video raises YouTubeUnavailableError."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError("Video unavailable")
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeUnavailableError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=test',
-                    output_dir=Path(temp_dir)
-                )
-
-            self.assertIn('unavailable', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_download_error_private(self, mock_ydl_class, mock_require):
-        """Test private video raises YouTubeUnavailableError."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError("Video is private")
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeUnavailableError):
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=test',
-                    output_dir=Path(temp_dir)
-                )
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_download_extractor_error(self, mock_ydl_class, mock_require):
-        """Test ExtractorError raises YouTubeURLError."""
-        from yt_dlp.utils import ExtractorError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = ExtractorError("Unable to extract video")
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeURLError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=test',
-                    output_dir=Path(temp_dir)
-                )
-
-            self.assertIn('Could not process', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_download_postprocessing_error(self, mock_ydl_class, mock_require):
-        """Test PostProcessingError raises YouTubeDownloadError."""
-        from yt_dlp.utils import PostProcessingError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = PostProcessingError("FFmpeg failed")
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeDownloadError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=test',
-                    output_dir=Path(temp_dir)
-                )
-
-            self.assertIn('Audio conversion failed', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    @patch('cesar.youtube_handler._cleanup_partial_files')
-    def test_cleanup_called_on_failure(self, mock_cleanup, mock_ydl_class, mock_require):
-        """Test partial files are cleaned up on download failure."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError("Network error")
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeDownloadError):
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=test',
-                    output_dir=Path(temp_dir)
-                )
-
-        # Verify cleanup was called
-        mock_cleanup.assert_called_once()
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_finds_alternative_extensions(self, mock_ydl_class, mock_require):
-        """Test download finds file with alternative extension."""
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.return_value = {'title': 'Test Video'}
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            with patch('cesar.youtube_handler.uuid.uuid4', return_value='test'):
-                # Create an .opus file instead of .m4a
-                (temp_path / 'test.opus').touch()
-
-                result = download_youtube_audio(
-                    'https://youtube.com/watch?v=abc123',
-                    output_dir=temp_path
-                )
-
-            self.assertEqual(result, temp_path / 'test.opus')
-
-
-class TestCleanupYouTubeTempDir(unittest.TestCase):
-    """Tests for cleanup_youtube_temp_dir function."""
-
-    def test_cleanup_nonexistent_dir(self):
-        """Test cleanup returns 0 when directory doesn't exist."""
-        with patch('cesar.youtube_handler.tempfile.gettempdir', return_value='/nonexistent'):
-            count = cleanup_youtube_temp_dir()
-            self.assertEqual(count, 0)
-
-    def test_cleanup_empty_dir(self):
-        """Test cleanup returns 0 when directory is empty."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            cesar_dir = temp_path / 'cesar-youtube'
-            cesar_dir.mkdir()
-
-            with patch('cesar.youtube_handler.tempfile.gettempdir', return_value=temp_dir):
-                count = cleanup_youtube_temp_dir()
-
-            self.assertEqual(count, 0)
-
-    def test_cleanup_with_files(self):
-        """Test cleanup removes files and returns count."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            cesar_dir = temp_path / 'cesar-youtube'
-            cesar_dir.mkdir()
-
-            # Create some files
-            (cesar_dir / 'file1.m4a').touch()
-            (cesar_dir / 'file2.m4a').touch()
-            (cesar_dir / 'file3.part').touch()
-
-            with patch('cesar.youtube_handler.tempfile.gettempdir', return_value=temp_dir):
-                count = cleanup_youtube_temp_dir()
-
-            self.assertEqual(count, 3)
-            # Verify files are deleted
-            self.assertFalse((cesar_dir / 'file1.m4a').exists())
-            self.assertFalse((cesar_dir / 'file2.m4a').exists())
-            self.assertFalse((cesar_dir / 'file3.part').exists())
-
-    def test_cleanup_preserves_subdirectories(self):
-        """Test cleanup only removes files, not subdirectories."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            cesar_dir = temp_path / 'cesar-youtube'
-            cesar_dir.mkdir()
-
-            # Create a file and a subdirectory
-            (cesar_dir / 'file1.m4a').touch()
-            (cesar_dir / 'subdir').mkdir()
-            (cesar_dir / 'subdir' / 'nested.m4a').touch()
-
-            with patch('cesar.youtube_handler.tempfile.gettempdir', return_value=temp_dir):
-                count = cleanup_youtube_temp_dir()
-
-            # Only the top-level file should be counted
-            self.assertEqual(count, 1)
-            # Subdirectory should still exist
-            self.assertTrue((cesar_dir / 'subdir').exists())
-
-
-class TestExtractVideoId(unittest.TestCase):
-    """Tests for extract_video_id function."""
-
-    def test_extract_from_watch_url(self):
-        """Test extraction from standard watch URL."""
-        url = 'https://youtube.com/watch?v=dQw4w9WgXcQ'
-        self.assertEqual(extract_video_id(url), 'dQw4w9WgXcQ')
-
-    def test_extract_from_youtu_be(self):
-        """Test extraction from shortened youtu.be URL."""
-        url = 'https://youtu.be/dQw4w9WgXcQ'
-        self.assertEqual(extract_video_id(url), 'dQw4w9WgXcQ')
-
-    def test_extract_from_shorts(self):
-        """Test extraction from YouTube Shorts URL."""
-        url = 'https://youtube.com/shorts/abc123XYZ00'
-        self.assertEqual(extract_video_id(url), 'abc123XYZ00')
-
-    def test_extract_from_embed(self):
-        """Test extraction from embed URL."""
-        url = 'https://youtube.com/embed/dQw4w9WgXcQ'
-        self.assertEqual(extract_video_id(url), 'dQw4w9WgXcQ')
-
-    def test_extract_with_extra_params(self):
-        """Test extraction with additional URL parameters."""
-        url = 'https://youtube.com/watch?v=dQw4w9WgXcQ&list=PLxyz'
-        self.assertEqual(extract_video_id(url), 'dQw4w9WgXcQ')
-
-    def test_extract_from_invalid_url(self):
-        """Test extraction from non-YouTube URL returns 'unknown'."""
-        url = 'https://example.com/video'
-        self.assertEqual(extract_video_id(url), 'unknown')
-
-    def test_extract_from_empty_string(self):
-        """Test extraction from empty string returns 'unknown'."""
-        self.assertEqual(extract_video_id(''), 'unknown')
-
-    def test_extract_from_none(self):
-        """Test extraction from None returns 'unknown'."""
-        self.assertEqual(extract_video_id(None), 'unknown')
-
-
-class TestExceptionAttributes(unittest.TestCase):
-    """Tests for exception class attributes."""
-
-    def test_youtube_download_error_attributes(self):
-        """Test YouTubeDownloadError has correct attributes."""
-        self.assertEqual(YouTubeDownloadError.error_type, 'youtube_error')
-        self.assertEqual(YouTubeDownloadError.http_status, 400)
-
-    def test_youtube_url_error_attributes(self):
-        """Test YouTubeURLError has correct attributes."""
-        self.assertEqual(YouTubeURLError.error_type, 'invalid_youtube_url')
-        self.assertEqual(YouTubeURLError.http_status, 400)
-
-    def test_youtube_unavailable_error_attributes(self):
-        """Test YouTubeUnavailableError has correct attributes."""
-        self.assertEqual(YouTubeUnavailableError.error_type, 'video_unavailable')
-        self.assertEqual(YouTubeUnavailableError.http_status, 404)
-
-    def test_youtube_rate_limit_error_attributes(self):
-        """Test YouTubeRateLimitError has correct attributes."""
-        self.assertEqual(YouTubeRateLimitError.error_type, 'rate_limited')
-        self.assertEqual(YouTubeRateLimitError.http_status, 429)
-
-    def test_youtube_age_restricted_error_attributes(self):
-        """Test YouTubeAgeRestrictedError has correct attributes."""
-        self.assertEqual(YouTubeAgeRestrictedError.error_type, 'age_restricted')
-        self.assertEqual(YouTubeAgeRestrictedError.http_status, 403)
-
-    def test_youtube_network_error_attributes(self):
-        """Test YouTubeNetworkError has correct attributes."""
-        self.assertEqual(YouTubeNetworkError.error_type, 'network_error')
-        self.assertEqual(YouTubeNetworkError.http_status, 502)
-
-    def test_ffmpeg_not_found_error_attributes(self):
-        """Test FFmpegNotFoundError has correct attributes."""
-        self.assertEqual(FFmpegNotFoundError.error_type, 'ffmpeg_not_found')
-        self.assertEqual(FFmpegNotFoundError.http_status, 503)
-
-
-class TestDownloadErrorDetection(unittest.TestCase):
-    """Tests for error detection patterns in download_youtube_audio."""
-
-    def setUp(self):
-        """Clear FFmpeg cache before each test."""
-        check_ffmpeg_available.cache_clear()
-
-    def tearDown(self):
-        """Clear FFmpeg cache after each test."""
-        check_ffmpeg_available.cache_clear()
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_detects_age_restricted(self, mock_ydl_class, mock_require):
-        """Test age-restricted video raises YouTubeAgeRestrictedError."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError(
-            "Sign in to confirm your age"
+    assert 'FFmpeg not found' in str(exc_info.value)
+
+
+# Tests for download_youtube_audio function.
+
+
+def test_invalid_url_raises_error():
+    """Test invalid URL raises YouTubeURLError."""
+    with pytest.raises(YouTubeURLError) as exc_info:
+        download_youtube_audio('https://vimeo.com/123456')
+
+    assert 'Invalid YouTube URL' in str(exc_info.value)
+
+
+def test_invalid_url_includes_video_id():
+    """Test invalid URL error includes video ID extraction."""
+    with pytest.raises(YouTubeURLError) as exc_info:
+        download_youtube_audio('https://example.com/video')
+
+    assert 'unknown' in str(exc_info.value)
+    assert 'video:' in str(exc_info.value)
+
+
+def test_invalid_url_skips_ffmpeg_check(mock_require):
+    """Test an invalid URL is rejected before FFmpeg is checked."""
+    with pytest.raises(YouTubeURLError):
+        download_youtube_audio('https://vimeo.com/123456')
+
+    mock_require.assert_not_called()
+
+
+def test_ffmpeg_missing_raises_error(mock_require):
+    """Test FFmpeg missing raises FFmpegNotFoundError."""
+    mock_require.side_effect = FFmpegNotFoundError("FFmpeg not found")
+
+    with pytest.raises(FFmpegNotFoundError):
+        download_youtube_audio('https://youtube.com/watch?v=test')
+
+
+def test_download_success(mock_ydl, output_dir, fixed_uuid):
+    """Test successful download returns path to audio file."""
+    mock_ydl.extract_info.return_value = {'title': 'Test Video'}
+
+    # Create the expected output file
+    (output_dir / 'test.m4a').touch()
+
+    result = download_youtube_audio(
+        'https://youtube.com/watch?v=abc123',
+        output_dir=output_dir
+    )
+
+    assert result == output_dir / 'test.m4a'
+    mock_ydl.extract_info.assert_called_once()
+
+
+def test_download_uses_post_hook_path(mock_ydl_class, mock_ydl, output_dir):
+    """Test the file reported through post_hooks is returned without a scan."""
+    final_path = output_dir / 'reported.m4a'
+
+    def extract_info(url, download):
+        ydl_opts = mock_ydl_class.call_args.args[0]
+        for hook in ydl_opts['post_hooks']:
+            hook(str(final_path))
+        return {'title': 'Test Video'}
+
+    mock_ydl.extract_info.side_effect = extract_info
+
+    with patch('cesar.youtube_handler._find_output_file') as mock_find:
+        result = download_youtube_audio(
+            'https://youtube.com/watch?v=abc123',
+            output_dir=output_dir
         )
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeAgeRestrictedError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=test123test',
-                    output_dir=Path(temp_dir)
-                )
-
-            self.assertIn('Age-restricted', str(ctx.exception))
-            self.assertIn('test123test', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_detects_private_video(self, mock_ydl_class, mock_require):
-        """Test private video raises YouTubeUnavailableError with specific message."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError(
-            "This is a private video"
+    assert result == final_path
+    mock_find.assert_not_called()
+
+
+def test_finds_alternative_extensions(mock_ydl, output_dir, fixed_uuid):
+    """Test download finds file with alternative extension."""
+    mock_ydl.extract_info.return_value = {'title': 'Test Video'}
+
+    # Create an .opus file instead of .m4a, next to another
+    # download's .m4a that must not be picked up
+    (output_dir / 'test.opus').touch()
+    (output_dir / 'other.m4a').touch()
+
+    result = download_youtube_audio(
+        'https://youtube.com/watch?v=abc123',
+        output_dir=output_dir
+    )
+
+    assert result == output_dir / 'test.opus'
+
+
+def _download_opts(mock_ydl_class, mock_ydl, output_dir):
+    """Run a successful download and return the options given to YoutubeDL."""
+    mock_ydl.extract_info.return_value = {'title': 'Test Video'}
+
+    (output_dir / 'test.m4a').touch()
+    download_youtube_audio(
+        'https://youtube.com/watch?v=abc123',
+        output_dir=output_dir
+    )
+
+    return mock_ydl_class.call_args.args[0]
+
+
+def test_download_requests_audio_only(mock_ydl_class, mock_ydl, output_dir, fixed_uuid):
+    """Test yt-dlp is asked for a single audio stream and no side files."""
+    ydl_opts = _download_opts(mock_ydl_class, mock_ydl, output_dir)
+
+    assert ydl_opts['format'] == 'bestaudio[ext=m4a]/bestaudio/best'
+    assert ydl_opts['noplaylist'] is True
+    for key in ('writesubtitles', 'writeautomaticsub', 'writeinfojson', 'writethumbnail'):
+        assert ydl_opts[key] is False
+    assert ydl_opts['postprocessors'][0]['key'] == 'FFmpegExtractAudio'
+
+
+def test_download_restricts_extractors(mock_ydl_class, mock_ydl, output_dir, fixed_uuid):
+    """Test yt-dlp only loads the YouTube extractors."""
+    ydl_opts = _download_opts(mock_ydl_class, mock_ydl, output_dir)
+
+    assert ydl_opts['allowed_extractors'] == [
+        'youtube', 'youtube:tab', 'youtube:playlist', 'youtubeytbe',
+    ]
+
+
+def test_allowed_extractors_cover_accepted_urls(
+    mock_ydl_class, mock_ydl, output_dir, fixed_uuid
+):
+    """Test every URL form is_youtube_url accepts has an allowed extractor.
+
+    Uses the real YoutubeDL (imported before the module-wide patch) to
+    load the allowed extractors and ask each whether it handles the URL.
+    """
+    ydl_opts = _download_opts(mock_ydl_class, mock_ydl, output_dir)
+    ydl = YoutubeDL({'allowed_extractors': ydl_opts['allowed_extractors'], 'quiet': True})
+
+    for prefix in youtube_handler._YOUTUBE_URL_PREFIXES:
+        sep = '&' if '?' in prefix else '?'
+        for suffix in ('', f'{sep}t=42', f'{sep}list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf'):
+            url = f'{prefix}dQw4w9WgXcQ{suffix}'
+            assert is_youtube_url(url)
+            assert any(ie.suitable(url) for ie in ydl._ies.values()), url
+
+
+def test_download_sets_throttling_workarounds(
+    mock_ydl_class, mock_ydl, output_dir, fixed_uuid
+):
+    """Test chunked, parallel fetches and the ios, web player clients are set."""
+    ydl_opts = _download_opts(mock_ydl_class, mock_ydl, output_dir)
+
+    assert ydl_opts['http_chunk_size'] == 10 * 1024 * 1024
+    assert ydl_opts['concurrent_fragment_downloads'] == 8
+    assert ydl_opts['extractor_args'] == {
+        'youtube': {'player_client': ['ios', 'web']}
+    }
+
+
+def test_prefers_m4a_over_alternative_extensions(mock_ydl, output_dir, fixed_uuid):
+    """Test .m4a output wins when yt-dlp left several extensions behind."""
+    mock_ydl.extract_info.return_value = {'title': 'Test Video'}
+
+    for name in ('test.opus', 'test.m4a', 'test.m4a.part', 'other.m4a'):
+        (output_dir / name).touch()
+
+    result = download_youtube_audio(
+        'https://youtube.com/watch?v=abc123',
+        output_dir=output_dir
+    )
+
+    assert result == output_dir / 'test.m4a'
+
+
+def test_download_extractor_error(mock_ydl):
+    """Test ExtractorError raises YouTubeURLError."""
+    mock_ydl.extract_info.side_effect = ExtractorError("Unable to extract video")
+
+    with pytest.raises(YouTubeURLError) as exc_info:
+        download_youtube_audio(
+            'https://youtube.com/watch?v=test',
+            output_dir=_ERROR_PATH_DIR
         )
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeUnavailableError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=pvt123pvt00',
-                    output_dir=Path(temp_dir)
-                )
-
-            self.assertIn('Private', str(ctx.exception))
-            self.assertIn('pvt123pvt00', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_detects_geo_restricted(self, mock_ydl_class, mock_require):
-        """Test geo-restricted video raises YouTubeUnavailableError."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError(
-            "Video not available in your country"
+    assert 'Could not process' in str(exc_info.value)
+
+
+def test_download_postprocessing_error(mock_ydl):
+    """Test PostProcessingError raises YouTubeDownloadError."""
+    mock_ydl.extract_info.side_effect = PostProcessingError("FFmpeg failed")
+
+    with pytest.raises(YouTubeDownloadError) as exc_info:
+        download_youtube_audio(
+            'https://youtube.com/watch?v=test',
+            output_dir=_ERROR_PATH_DIR
         )
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeUnavailableError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=geo123geo00',
-                    output_dir=Path(temp_dir)
-                )
-
-            self.assertIn('Geo-restricted', str(ctx.exception))
-            self.assertIn('geo123geo00', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_detects_network_timeout(self, mock_ydl_class, mock_require):
-        """Test network timeout raises YouTubeNetworkError."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError(
-            "Connection timed out"
+    assert 'Audio conversion failed' in str(exc_info.value)
+
+
+@patch('cesar.youtube_handler._cleanup_partial_files')
+def test_cleanup_called_on_failure(mock_cleanup, mock_ydl):
+    """Test partial files are cleaned up on download failure."""
+    mock_ydl.extract_info.side_effect = DownloadError("Network error")
+
+    with pytest.raises(YouTubeDownloadError):
+        download_youtube_audio(
+            'https://youtube.com/watch?v=test',
+            output_dir=_ERROR_PATH_DIR
         )
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeNetworkError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=net123net00',
-                    output_dir=Path(temp_dir)
-                )
-
-            self.assertIn('timeout', str(ctx.exception))
-            self.assertIn('net123net00', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_detects_connection_reset(self, mock_ydl_class, mock_require):
-        """Test connection reset raises YouTubeNetworkError."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError(
-            "Connection reset by peer"
+    # Verify cleanup was called
+    mock_cleanup.assert_called_once()
+
+
+def test_failure_removes_only_this_downloads_partial_files(
+    mock_ydl, output_dir, fixed_uuid
+):
+    """Test partial files for the failed download are removed, others kept."""
+    mock_ydl.extract_info.side_effect = DownloadError("Network error")
+    for name in ('test.webm', 'test.m4a.part', 'test.m4a.ytdl', 'other.m4a'):
+        (output_dir / name).touch()
+
+    with pytest.raises(YouTubeDownloadError):
+        download_youtube_audio(
+            'https://youtube.com/watch?v=test',
+            output_dir=output_dir
         )
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeNetworkError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=rst123rst00',
-                    output_dir=Path(temp_dir)
-                )
-
-            self.assertIn('interrupted', str(ctx.exception))
-            self.assertIn('rst123rst00', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_detects_rate_limit_403(self, mock_ydl_class, mock_require):
-        """Test 403 error raises YouTubeRateLimitError."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError(
-            "HTTP Error 403: Forbidden"
+    assert sorted(p.name for p in output_dir.iterdir()) == ['other.m4a']
+
+
+# Tests for error detection patterns in download_youtube_audio.
+
+
+@pytest.mark.parametrize("message,error_class,fragment,video_id", [
+    pytest.param("Sign in to confirm your age", YouTubeAgeRestrictedError,
+                 'Age-restricted', 'test123test', id="age_restricted"),
+    pytest.param("This is a private video", YouTubeUnavailableError,
+                 'Private', 'pvt123pvt00', id="private_video"),
+    pytest.param("Video is private", YouTubeUnavailableError,
+                 'Private', 'pvt456pvt00', id="is_private"),
+    pytest.param("Video not available in your country", YouTubeUnavailableError,
+                 'Geo-restricted', 'geo123geo00', id="geo_restricted"),
+    pytest.param("Connection timed out", YouTubeNetworkError,
+                 'timeout', 'net123net00', id="network_timeout"),
+    pytest.param("Connection reset by peer", YouTubeNetworkError,
+                 'interrupted', 'rst123rst00', id="connection_reset"),
+    pytest.param("HTTP Error 403: Forbidden", YouTubeRateLimitError,
+                 'limiting', 'lim123lim00', id="rate_limit_403"),
+    pytest.param("HTTP Error 429: Too Many Requests", YouTubeRateLimitError,
+                 'limiting', 'lim456lim00', id="rate_limit_429"),
+    pytest.param("Video unavailable", YouTubeUnavailableError,
+                 'unavailable', 'abc123XYZ99', id="unavailable"),
+])
+def test_download_error_detection(mock_ydl, message, error_class,
+                                  fragment, video_id):
+    """Test each DownloadError message maps to its exception and message."""
+    mock_ydl.extract_info.side_effect = DownloadError(message)
+
+    with pytest.raises(error_class) as exc_info:
+        download_youtube_audio(
+            f'https://youtube.com/watch?v={video_id}',
+            output_dir=_ERROR_PATH_DIR
         )
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeRateLimitError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=lim123lim00',
-                    output_dir=Path(temp_dir)
-                )
-
-            self.assertIn('limiting', str(ctx.exception))
-            self.assertIn('lim123lim00', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    @patch('cesar.youtube_handler.yt_dlp.YoutubeDL')
-    def test_error_message_includes_video_id(self, mock_ydl_class, mock_require):
-        """Test that error messages include video ID."""
-        from yt_dlp.utils import DownloadError
-
-        mock_ydl = MagicMock()
-        mock_ydl_class.return_value.__enter__.return_value = mock_ydl
-        mock_ydl.extract_info.side_effect = DownloadError("Video unavailable")
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with self.assertRaises(YouTubeUnavailableError) as ctx:
-                download_youtube_audio(
-                    'https://youtube.com/watch?v=abc123XYZ99',
-                    output_dir=Path(temp_dir)
-                )
-
-            # Verify video ID appears in message
-            self.assertIn('abc123XYZ99', str(ctx.exception))
-            # Verify format matches expected pattern
-            self.assertIn('video:', str(ctx.exception))
-
-    @patch('cesar.youtube_handler.require_ffmpeg')
-    def test_invalid_url_includes_video_id(self, mock_require):
-        """Test invalid URL error includes video ID extraction."""
-        with self.assertRaises(YouTubeURLError) as ctx:
-            download_youtube_audio('https://example.com/video')
-
-        self.assertIn('unknown', str(ctx.exception))
-        self.assertIn('video:', str(ctx.exception))
-
-
-if __name__ == "__main__":
-    unittest.main()
+    assert fragment in str(exc_info.value)
+    # Verify the video ID appears in the expected format
+    assert f'video: {video_id}' in str(exc_info.value)
+
+
+# Tests for cleanup_youtube_temp_dir function.
+
+
+def test_cleanup_nonexistent_dir():
+    """Test cleanup returns 0 when directory doesn't exist."""
+    with patch('cesar.youtube_handler.tempfile.gettempdir', return_value='/nonexistent'):
+        count = cleanup_youtube_temp_dir()
+    assert count == 0
+
+
+def test_cleanup_empty_dir(tmp_path):
+    """Test cleanup returns 0 when directory is empty."""
+    cesar_dir = tmp_path / 'cesar-youtube'
+    cesar_dir.mkdir()
+
+    with patch('cesar.youtube_handler.tempfile.gettempdir', return_value=str(tmp_path)):
+        count = cleanup_youtube_temp_dir()
+
+    assert count == 0
+
+
+def test_cleanup_with_files(tmp_path):
+    """Test cleanup removes files and returns count."""
+    cesar_dir = tmp_path / 'cesar-youtube'
+    cesar_dir.mkdir()
+
+    # Create some files
+    (cesar_dir / 'file1.m4a').touch()
+    (cesar_dir / 'file2.m4a').touch()
+    (cesar_dir / 'file3.part').touch()
+
+    with patch('cesar.youtube_handler.tempfile.gettempdir', return_value=str(tmp_path)):
+        count = cleanup_youtube_temp_dir()
+
+    assert count == 3
+    # Verify files are deleted
+    assert not (cesar_dir / 'file1.m4a').exists()
+    assert not (cesar_dir / 'file2.m4a').exists()
+    assert not (cesar_dir / 'file3.part').exists()
+
+
+def test_cleanup_preserves_subdirectories(tmp_path):
+    """Test cleanup only removes files, not subdirectories."""
+    cesar_dir = tmp_path / 'cesar-youtube'
+    cesar_dir.mkdir()
+
+    # Create a file and a subdirectory
+    (cesar_dir / 'file1.m4a').touch()
+    (cesar_dir / 'subdir').mkdir()
+    (cesar_dir / 'subdir' / 'nested.m4a').touch()
+
+    with patch('cesar.youtube_handler.tempfile.gettempdir', return_value=str(tmp_path)):
+        count = cleanup_youtube_temp_dir()
+
+    # Only the top-level file should be counted
+    assert count == 1
+    # Subdirectory should still exist
+    assert (cesar_dir / 'subdir').exists()
+
+
+# Tests for extract_video_id function.
+
+
+def test_extract_from_watch_url():
+    """Test extraction from standard watch URL."""
+    url = 'https://youtube.com/watch?v=dQw4w9WgXcQ'
+    assert extract_video_id(url) == 'dQw4w9WgXcQ'
+
+
+def test_extract_from_youtu_be():
+    """Test extraction from shortened youtu.be URL."""
+    url = 'https://youtu.be/dQw4w9WgXcQ'
+    assert extract_video_id(url) == 'dQw4w9WgXcQ'
+
+
+def test_extract_from_shorts():
+    """Test extraction from YouTube Shorts URL."""
+    url = 'https://youtube.com/shorts/abc123XYZ00'
+    assert extract_video_id(url) == 'abc123XYZ00'
+
+
+def test_extract_from_embed():
+    """Test extraction from embed URL."""
+    url = 'https://youtube.com/embed/dQw4w9WgXcQ'
+    assert extract_video_id(url) == 'dQw4w9WgXcQ'
+
+
+def test_extract_from_e_url():
+    """Test extraction from legacy /e/ embed URL."""
+    url = 'https://youtube.com/e/dQw4w9WgXcQ'
+    assert extract_video_id(url) == 'dQw4w9WgXcQ'
+
+
+def test_extract_with_extra_params():
+    """Test extraction with additional URL parameters."""
+    url = 'https://youtube.com/watch?v=dQw4w9WgXcQ&list=PLxyz'
+    assert extract_video_id(url) == 'dQw4w9WgXcQ'
+
+
+@pytest.mark.parametrize("url", [
+    'youtu.be/dQw4w9WgXcQ',
+    'www.youtube.com/watch?v=dQw4w9WgXcQ',
+    'youtube.com/shorts/dQw4w9WgXcQ',
+])
+def test_extract_from_url_without_scheme(url):
+    """Test extraction from URLs typed without http(s)://."""
+    assert extract_video_id(url) == 'dQw4w9WgXcQ'
+
+
+def test_extract_from_invalid_url():
+    """Test extraction from non-YouTube URL returns 'unknown'."""
+    url = 'https://example.com/video'
+    assert extract_video_id(url) == 'unknown'
+
+
+def test_extract_from_empty_string():
+    """Test extraction from empty string returns 'unknown'."""
+    assert extract_video_id('') == 'unknown'
+
+
+def test_extract_from_none():
+    """Test extraction from None returns 'unknown'."""
+    assert extract_video_id(None) == 'unknown'
+
+
+def test_extract_from_overlong_url():
+    """Test extraction from a URL over the length cap returns 'unknown'."""
+    url = 'https://youtube.com/watch?v=dQw4w9WgXcQ&x=' + '_' * 100_000
+    assert extract_video_id(url) == 'unknown'
+
+
+# Tests for exception class attributes.
+
+
+@pytest.mark.parametrize("error_class,error_type,http_status", [
+    (YouTubeDownloadError, 'youtube_error', 400),
+    (YouTubeURLError, 'invalid_youtube_url', 400),
+    (YouTubeUnavailableError, 'video_unavailable', 404),
+    (YouTubeRateLimitError, 'rate_limited', 429),
+    (YouTubeAgeRestrictedError, 'age_restricted', 403),
+    (YouTubeNetworkError, 'network_error', 502),
+    (FFmpegNotFoundError, 'ffmpeg_not_found', 503),
+])
+def test_exception_attributes(error_class, error_type, http_status):
+    """Test each exception class has the correct error_type and http_status."""
+    assert error_class.error_type == error_type
+    assert error_class.http_status == http_status